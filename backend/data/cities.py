@@ -27,7 +27,17 @@ Usage:
     city = get_city_by_name("Delhi")
 """
 
-from typing import List, Dict, Optional
+import heapq
+import math
+import re
+import sys
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import ClassVar, Iterator, List, Dict, Optional, Tuple
+
+from utils.distance import haversine_all
 
 # Complete Indian Cities Dataset
 INDIAN_CITIES = [
@@ -174,12 +184,119 @@ INDIAN_CITIES = [
 ]
 
 
+# === CITY RECORDS ===
+
+@dataclass(frozen=True, slots=True)
+class City:
+    """
+    Immutable city record for internal lookups (distance math, validation).
+    
+    API responses keep returning the INDIAN_CITIES dicts; these records
+    give slot-based attribute access without per-field dict hashing.
+    """
+    name: str
+    state: str
+    lat: float
+    lon: float
+    tier: int
+    tourist: bool = False
+    
+    # Every city is in India; kept on the class rather than per record
+    country: ClassVar[str] = "India"
+
+
+# Records parallel to INDIAN_CITIES (CITIES[i] mirrors INDIAN_CITIES[i]).
+# State names repeat across many cities, so they are interned.
+CITIES: Tuple[City, ...] = tuple(
+    City(
+        name=city["name"],
+        state=sys.intern(city["state"]),
+        lat=city["lat"],
+        lon=city["lon"],
+        tier=city["tier"],
+        tourist=city.get("tourist", False)
+    )
+    for city in INDIAN_CITIES
+)
+
+
+# === LOOKUP INDICES ===
+# Built once at import; the dataset is static for the lifetime of the process.
+
+# Lowercased names, parallel to INDIAN_CITIES
+_LOWER_NAMES: List[str] = [city["name"].lower() for city in INDIAN_CITIES]
+
+# Coordinates as contiguous float arrays, parallel to INDIAN_CITIES,
+# for distance math over many cities at once (CITY_LATS[i] is INDIAN_CITIES[i]["lat"])
+CITY_LATS = array("d", (city["lat"] for city in INDIAN_CITIES))
+CITY_LONS = array("d", (city["lon"] for city in INDIAN_CITIES))
+
+# Substring index for autocomplete: 2- and 3-character shingles -> city indices.
+# Posting lists are in dataset order, so filtered results keep that order.
+_BIGRAMS: Dict[str, List[int]] = defaultdict(list)
+_TRIGRAMS: Dict[str, List[int]] = defaultdict(list)
+for _i, _name in enumerate(_LOWER_NAMES):
+    for _gram in {_name[j:j + 2] for j in range(len(_name) - 1)}:
+        _BIGRAMS[_gram].append(_i)
+    for _gram in {_name[j:j + 3] for j in range(len(_name) - 2)}:
+        _TRIGRAMS[_gram].append(_i)
+_BIGRAMS = dict(_BIGRAMS)
+_TRIGRAMS = dict(_TRIGRAMS)
+
+# Coarse 1°x1° grid over coordinates: (floor(lat), floor(lon)) -> city indices
+_GRID: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+for _i, (_lat, _lon) in enumerate(zip(CITY_LATS, CITY_LONS)):
+    _GRID[(math.floor(_lat), math.floor(_lon))].append(_i)
+_GRID = dict(_GRID)
+
+# All lowercased names as one newline-separated corpus, for multi-token
+# queries matched with a single compiled pattern (line start -> city index)
+_NAME_CORPUS = "\n".join(_LOWER_NAMES)
+_INDEX_BY_OFFSET: Dict[int, int] = {}
+_offset = 0
+for _i, _name in enumerate(_LOWER_NAMES):
+    _INDEX_BY_OFFSET[_offset] = _i
+    _offset += len(_name) + 1
+
+# Exact-name indices (lowercased name -> city dict / City record / position)
+_CITY_BY_LOWER_NAME: Dict[str, Dict] = {}
+_RECORD_BY_LOWER_NAME: Dict[str, City] = {}
+_INDEX_BY_LOWER_NAME: Dict[str, int] = {}
+for _i, (_city, _record) in enumerate(zip(INDIAN_CITIES, CITIES)):
+    _CITY_BY_LOWER_NAME.setdefault(_record.name.lower(), _city)
+    _RECORD_BY_LOWER_NAME.setdefault(_record.name.lower(), _record)
+    _INDEX_BY_LOWER_NAME.setdefault(_record.name.lower(), _i)
+
+# City-to-city distance matrix in whole km, rounded exactly like
+# utils.distance.calculate_distance: _DISTANCE_KM[i][j] is the distance
+# between INDIAN_CITIES[i] and INDIAN_CITIES[j]. Unsigned 16-bit rows
+# are plenty for distances within India.
+_DISTANCE_KM: Tuple[array, ...] = tuple(
+    array("H", map(round, haversine_all(_lat, _lon, CITY_LATS, CITY_LONS)))
+    for _lat, _lon in zip(CITY_LATS, CITY_LONS)
+)
+
+# Group indices for state / tier / tourist filters
+_BY_STATE: Dict[str, List[Dict]] = defaultdict(list)
+_BY_TIER: Dict[int, List[Dict]] = defaultdict(list)
+for _city in INDIAN_CITIES:
+    _BY_STATE[sys.intern(_city["state"].lower())].append(_city)
+    _BY_TIER[_city.get("tier")].append(_city)
+_BY_STATE = dict(_BY_STATE)
+_BY_TIER = dict(_BY_TIER)
+_TOURIST: List[Dict] = [city for city in INDIAN_CITIES if city.get("tourist", False)]
+
+
 # === UTILITY FUNCTIONS ===
 
 def search_cities(query: str, limit: int = 7) -> List[Dict]:
     """
     Search cities by name (case-insensitive)
     
+    Matches the query as a substring of the name. For multi-word
+    queries, names containing every word in any order are added after
+    the substring matches (e.g. "blair port" -> Port Blair).
+    
     Args:
         query: Search term
         limit: Maximum results to return
@@ -187,15 +304,63 @@ def search_cities(query: str, limit: int = 7) -> List[Dict]:
     Returns:
         List of matching cities
     """
-    if len(query.strip()) < 2:
+    if len(query.strip()) < 2 or limit < 1:
         return []
     
-    query_lower = query.lower().strip()
-    matches = [
-        city for city in INDIAN_CITIES
-        if query_lower in city["name"].lower()
-    ]
-    return matches[:limit]
+    return list(_search_normalized(query.lower().strip(), limit))
+
+
+# Shortest word used by the multi-word (all tokens) search pass
+MIN_SEARCH_TOKEN_LENGTH = 3
+
+
+@lru_cache(maxsize=1024)
+def _search_normalized(query_lower: str, limit: int) -> Tuple[Dict, ...]:
+    """
+    Cached search on a normalized (lowercased, stripped) query.
+    
+    Autocomplete traffic repeats the same short prefixes, so results are
+    memoized; the tuple is shared between callers and never mutated.
+    """
+    # Narrow to the shortest posting list among the query's shingles,
+    # then confirm the full substring on that small candidate set
+    if len(query_lower) == 2:
+        candidates = _BIGRAMS.get(query_lower, [])
+    else:
+        candidates = min(
+            (_TRIGRAMS.get(query_lower[j:j + 3], []) for j in range(len(query_lower) - 2)),
+            key=len
+        )
+    
+    matched = []
+    for i in candidates:
+        if query_lower in _LOWER_NAMES[i]:
+            matched.append(i)
+            if len(matched) >= limit:
+                break
+    
+    # Multi-word queries also match names containing every word, but only
+    # when each word is long enough to be selective (trigram length);
+    # "a b" or "i n" would otherwise match most of the list
+    tokens = query_lower.split()
+    if (len(tokens) > 1 and len(matched) < limit
+            and all(len(token) >= MIN_SEARCH_TOKEN_LENGTH for token in tokens)):
+        seen = set(matched)
+        for i in _match_all_tokens(tokens):
+            if i not in seen:
+                matched.append(i)
+                if len(matched) >= limit:
+                    break
+    
+    return tuple(INDIAN_CITIES[i] for i in matched)
+
+
+def _match_all_tokens(tokens: List[str]) -> Iterator[int]:
+    """Yield indices of names containing every token, via one pattern over the name corpus"""
+    lookaheads = "".join(f"(?=[^\n]*{re.escape(token)})" for token in tokens)
+    pattern = re.compile(f"^{lookaheads}", re.MULTILINE)
+    for match in pattern.finditer(_NAME_CORPUS):
+        yield _INDEX_BY_OFFSET[match.start()]
 
 
 def get_city_by_name(name: str) -> Optional[Dict]:
@@ -208,11 +373,38 @@ def get_city_by_name(name: str) -> Optional[Dict]:
     Returns:
         City dict or None
     """
-    name_lower = name.lower().strip()
-    for city in INDIAN_CITIES:
-        if city["name"].lower() == name_lower:
-            return city
-    return None
+    return _CITY_BY_LOWER_NAME.get(name.lower().strip())
+
+
+def get_city_record(name: str) -> Optional[City]:
+    """
+    Get exact city record by name (case-insensitive)
+    
+    Args:
+        name: Exact city name
+        
+    Returns:
+        City record or None
+    """
+    return _RECORD_BY_LOWER_NAME.get(name.lower().strip())
+
+
+def get_city_distance(name_a: str, name_b: str) -> Optional[int]:
+    """
+    Get the precomputed distance between two cities (case-insensitive)
+    
+    Args:
+        name_a: Exact name of the first city
+        name_b: Exact name of the second city
+        
+    Returns:
+        Distance in kilometers (int, rounded), or None if either city is unknown
+    """
+    i = _INDEX_BY_LOWER_NAME.get(name_a.lower().strip())
+    j = _INDEX_BY_LOWER_NAME.get(name_b.lower().strip())
+    if i is None or j is None:
+        return None
+    return _DISTANCE_KM[i][j]
 
 
 def get_cities_by_state(state: str) -> List[Dict]:
@@ -225,10 +417,7 @@ def get_cities_by_state(state: str) -> List[Dict]:
     Returns:
         List of cities in that state
     """
-    return [
-        city for city in INDIAN_CITIES
-        if city["state"].lower() == state.lower().strip()
-    ]
+    return list(_BY_STATE.get(state.lower().strip(), []))
 
 
 def get_cities_by_tier(tier: int) -> List[Dict]:
@@ -241,10 +430,7 @@ def get_cities_by_tier(tier: int) -> List[Dict]:
     Returns:
         List of cities in that tier
     """
-    return [
-        city for city in INDIAN_CITIES
-        if city.get("tier") == tier
-    ]
+    return list(_BY_TIER.get(tier, []))
 
 
 def get_tourist_destinations() -> List[Dict]:
@@ -254,10 +440,7 @@ def get_tourist_destinations() -> List[Dict]:
     Returns:
         List of tourist cities
     """
-    return [
-        city for city in INDIAN_CITIES
-        if city.get("tourist", False)
-    ]
+    return list(_TOURIST)
 
 
 def validate_city_exists(name: str) -> bool:
@@ -273,13 +456,80 @@ def validate_city_exists(name: str) -> bool:
     return get_city_by_name(name) is not None
 
 
+def get_nearest_cities(lat: float, lon: float, limit: int = 5) -> List[Dict]:
+    """
+    Get the cities closest to a coordinate
+    
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        limit: Maximum results to return
+        
+    Returns:
+        List of city dicts with an added "distance_km" (int), nearest first
+    """
+    distances = haversine_all(lat, lon, CITY_LATS, CITY_LONS)
+    nearest = heapq.nsmallest(limit, range(len(distances)), key=distances.__getitem__)
+    return [
+        {**INDIAN_CITIES[i], "distance_km": round(distances[i])}
+        for i in nearest
+    ]
+
+
+def get_cities_within(lat: float, lon: float, radius_km: float, limit: int = 20) -> List[Dict]:
+    """
+    Get cities within a radius of a coordinate
+    
+    Only the grid cells overlapping the radius are scanned, so the exact
+    distance is computed for a handful of candidates instead of every city.
+    
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        radius_km: Search radius in kilometers
+        limit: Maximum results to return
+        
+    Returns:
+        List of city dicts with an added "distance_km" (int), nearest first
+    """
+    # ~111 km per degree of latitude; longitude degrees shrink with cos(lat)
+    lat_cells = math.ceil(radius_km / 111.0)
+    lon_cells = math.ceil(radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01)))
+    cell_lat, cell_lon = math.floor(lat), math.floor(lon)
+    
+    candidates = [
+        i
+        for dlat in range(-lat_cells, lat_cells + 1)
+        for dlon in range(-lon_cells, lon_cells + 1)
+        for i in _GRID.get((cell_lat + dlat, cell_lon + dlon), ())
+    ]
+    distances = haversine_all(
+        lat, lon,
+        [CITY_LATS[i] for i in candidates],
+        [CITY_LONS[i] for i in candidates]
+    )
+    
+    within = sorted(
+        (distance, i) for distance, i in zip(distances, candidates)
+        if distance <= radius_km
+    )
+    return [
+        {**INDIAN_CITIES[i], "distance_km": round(distance)}
+        for distance, i in within[:limit]
+    ]
+
+
 # === METADATA ===
+# Static dataset, so the stats are computed once at import
+_STATS: Dict = {
+    "total_cities": len(INDIAN_CITIES),
+    "tier_1": len(_BY_TIER.get(1, [])),
+    "tier_2": len(_BY_TIER.get(2, [])),
+    "tourist_destinations": len(_TOURIST),
+    "states_covered": len(set(city["state"] for city in INDIAN_CITIES))
+}
+
+
 def get_stats() -> Dict:
     """Get database statistics"""
-    return {
-        "total_cities": len(INDIAN_CITIES),
-        "tier_1": len(get_cities_by_tier(1)),
-        "tier_2": len(get_cities_by_tier(2)),
-        "tourist_destinations": len(get_tourist_destinations()),
-        "states_covered": len(set(city["state"] for city in INDIAN_CITIES))
-    }
\ No newline at end of file
+    return dict(_STATS)
@@ -18,32 +18,69 @@ ENHANCED SCHEMA (v2.0):
 - Photography and logistics hints
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, validator, field_validator
-from typing import List, Optional, Dict, Any, Literal
-import google.generativeai as genai
-import os
-import json
+from fastapi import APIRouter, HTTPException, Query, Response
+from pydantic import (
+    BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, ValidationInfo,
+    field_validator, model_validator,
+)
+from typing import Optional, Literal, get_args
+import asyncio
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from services.gemini_client import gemini_semaphore, get_model
+from utils.cache import TTLCache
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Initialize Gemini
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+# Output token budget per call: OUTPUT_TOKENS_BASE + OUTPUT_TOKENS_PER_DAY
+# per generated day, capped at MAX_OUTPUT_TOKENS (used as-is on retries)
+MAX_OUTPUT_TOKENS = 10000
+OUTPUT_TOKENS_BASE = 500
+OUTPUT_TOKENS_PER_DAY = 1500
+
+# Most itineraries accepted by one /api/itinerary/batch request
+MAX_BATCH_SIZE = 5
+
+# Longest trip accepted (same limit as Module 5's days field)
+MAX_TRIP_DAYS = 30
+
+# Trips longer than this are generated as concurrent day ranges of this size
+ITINERARY_SHARD_DAYS = 5
+# Temperature per attempt: a failed generation is retried once, less
+# creatively and with a JSON reminder
+RETRY_TEMPERATURES = (0.7, 0.5)
+RETRY_PROMPT_SUFFIX = "\n\nReturn ONLY valid JSON with no trailing commas."
+
+# Serialized recent itineraries keyed by request hash (per worker, 24h TTL)
+ITINERARY_CACHE_SIZE = 256
+ITINERARY_CACHE_TTL = 24 * 3600
+_itinerary_cache = TTLCache(maxsize=ITINERARY_CACHE_SIZE, ttl=ITINERARY_CACHE_TTL)
 
 # ============================================================================
 # ENHANCED REQUEST/RESPONSE SCHEMAS (v2.0)
 # ============================================================================
 
+# Instances are immutable, so cached and shared objects are safe to reuse.
+# The Module 5 configuration is a fixed shape, so unknown fields are rejected;
+# AI output is not, so extra keys there are ignored rather than fatal
+_REQUEST_CONFIG = ConfigDict(frozen=True, extra='forbid')
+_RESPONSE_CONFIG = ConfigDict(frozen=True)
+
 class TripSummary(BaseModel):
     """Trip summary from Module 5"""
+    model_config = _REQUEST_CONFIG
     source: str
     destination: str
     distance_km: int
     travel_mode: str
-    days: int
+    days: int = Field(..., ge=1, le=MAX_TRIP_DAYS)
 
 class Constraints(BaseModel):
     """Constraints from Module 5"""
+    model_config = _REQUEST_CONFIG
     pace: str
     places_per_day: int
     start_time: str
@@ -53,6 +90,7 @@ class Constraints(BaseModel):
 
 class OptionalConstraints(BaseModel):
     """Optional preferences from Module 5"""
+    model_config = _REQUEST_CONFIG
     avoid_early_mornings: bool = False
     prefer_less_walking: bool = False
     family_friendly: bool = False
@@ -61,9 +99,10 @@ class OptionalConstraints(BaseModel):
 
 class ItineraryRequest(BaseModel):
     """Complete configuration from Module 5"""
+    model_config = _REQUEST_CONFIG
     trip_summary: TripSummary
     constraints: Constraints
-    interests: List[str]
+    interests: list[str]
     optional_constraints: OptionalConstraints
     ai_model: str
 
@@ -71,6 +110,7 @@ class ItineraryRequest(BaseModel):
 
 class Meal(BaseModel):
     """Enhanced meal information"""
+    model_config = _RESPONSE_CONFIG
     meal_type: Literal["breakfast", "lunch", "dinner", "snack", "none"] = "none"
     cuisine_type: str = "local"
     dining_style: str = "restaurant"
@@ -78,6 +118,7 @@ class Meal(BaseModel):
 
 class ItineraryBlock(BaseModel):
     """Enhanced itinerary time block"""
+    model_config = _RESPONSE_CONFIG
     period: Literal["morning", "afternoon", "evening"]  # Simplified to only these three
     time_window: str  # e.g., "09:00–11:30"
     title: str
@@ -99,80 +140,184 @@ class ItineraryBlock(BaseModel):
 
 class DayPlan(BaseModel):
     """Enhanced day plan with theme and summary"""
+    model_config = _RESPONSE_CONFIG
     day: int
     day_theme: str
     day_summary: str
-    blocks: List[ItineraryBlock]
+    blocks: list[ItineraryBlock] = Field(min_length=1)  # At least 1 block per day
 
 class OverallStyle(BaseModel):
     """Overall trip style summary"""
+    model_config = _RESPONSE_CONFIG
     pace: str
     budget: str
 
 class ItineraryResponse(BaseModel):
     """Enhanced final itinerary output (v2.0)"""
+    model_config = _RESPONSE_CONFIG
     destination: str
     days: int
     overall_style: OverallStyle
-    itinerary: List[DayPlan]
+    itinerary: list[DayPlan]
+    
+    @model_validator(mode='after')
+    def check_day_sequence(self, info: ValidationInfo):
+        """Days must be numbered 1..days; optionally match the requested count"""
+        expected_days = (info.context or {}).get("expected_days", self.days)
+        if self.days != expected_days or [d.day for d in self.itinerary] != list(range(1, expected_days + 1)):
+            raise ValueError("AI response missing required fields or incorrect structure")
+        return self
+
+class ItineraryShard(BaseModel):
+    """Consecutive days of a long trip, generated by one Gemini call"""
+    model_config = _RESPONSE_CONFIG
+    itinerary: list[DayPlan]
+    
+    @model_validator(mode='after')
+    def check_day_range(self, info: ValidationInfo):
+        """Days must be numbered first_day..last_day when a range is given"""
+        day_range = (info.context or {}).get("day_range")
+        if day_range and [d.day for d in self.itinerary] != list(range(day_range[0], day_range[1] + 1)):
+            raise ValueError(f"AI response has wrong days for days {day_range[0]}–{day_range[1]}")
+        return self
+
+# Built once: validate Gemini's raw JSON and serialize the response body
+_ITINERARY_ADAPTER = TypeAdapter(ItineraryResponse)
+_SHARD_ADAPTER = TypeAdapter(ItineraryShard)
 
 # ============================================================================
-# ENHANCED PROMPT CONSTRUCTION (v2.0) - FIXED
+# GEMINI RESPONSE SCHEMA (JSON MODE)
 # ============================================================================
+# Passed as response_schema so Gemini emits JSON matching ItineraryResponse
+# directly. Written out by hand because the SDK's Schema type only accepts
+# an OpenAPI subset (no "default"/"title" keys as produced by Pydantic).
+# Enum values come from the Literal annotations so the two cannot drift.
 
-def build_gemini_prompt(config: ItineraryRequest) -> str:
+def _enum_values(model, field: str) -> list[str]:
+    return list(get_args(model.model_fields[field].annotation))
+
+_STRING = {"type": "STRING"}
+_NULLABLE_STRING = {"type": "STRING", "nullable": True}
+
+_MEAL_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "meal_type": {"type": "STRING", "format": "enum", "enum": _enum_values(Meal, "meal_type")},
+        "cuisine_type": _STRING,
+        "dining_style": _STRING,
+        "veg_friendly": {"type": "BOOLEAN"},
+    },
+    "required": ["meal_type", "cuisine_type", "dining_style", "veg_friendly"],
+}
+
+_BLOCK_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "period": {"type": "STRING", "format": "enum", "enum": _enum_values(ItineraryBlock, "period")},
+        "time_window": _STRING,
+        "title": _STRING,
+        "activity_type": {"type": "STRING", "format": "enum", "enum": _enum_values(ItineraryBlock, "activity_type")},
+        "description": _STRING,
+        "logistics_hint": _NULLABLE_STRING,
+        "meal": _MEAL_SCHEMA,
+        "photography_note": _NULLABLE_STRING,
+    },
+    "required": ["period", "time_window", "title", "activity_type", "description", "meal"],
+}
+
+_DAY_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "day": {"type": "INTEGER"},
+        "day_theme": _STRING,
+        "day_summary": _STRING,
+        "blocks": {"type": "ARRAY", "items": _BLOCK_SCHEMA, "min_items": 1},
+    },
+    "required": ["day", "day_theme", "day_summary", "blocks"],
+}
+
+ITINERARY_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "destination": _STRING,
+        "days": {"type": "INTEGER"},
+        "overall_style": {
+            "type": "OBJECT",
+            "properties": {"pace": _STRING, "budget": _STRING},
+            "required": ["pace", "budget"],
+        },
+        "itinerary": {"type": "ARRAY", "items": _DAY_SCHEMA},
+    },
+    "required": ["destination", "days", "overall_style", "itinerary"],
+}
+
+ITINERARY_SHARD_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {"itinerary": {"type": "ARRAY", "items": _DAY_SCHEMA}},
+    "required": ["itinerary"],
+}
+
+_RESPONSE_SCHEMAS = {
+    "itinerary": ITINERARY_RESPONSE_SCHEMA,
+    "shard": ITINERARY_SHARD_SCHEMA,
+}
+
+def output_token_budget(days: int) -> int:
     """
-    Construct enhanced Gemini prompt from Module 5 configuration.
-    
-    Enhanced design principles:
-    - Clear structure for AI understanding
-    - Strict JSON format requirement matching new schema
-    - Flexible time blocks instead of fixed periods
-    - Enhanced categorization and metadata
-    
-    Args:
-        config: Complete configuration from Module 5
+    Output token budget for generating the given number of days.
     
-    Returns:
-        Formatted prompt string
+    Gemini latency grows with the budget it may emit, so short trips get
+    a smaller one. A day with four detailed blocks is ~800 tokens; the
+    per-day allowance leaves roughly 2x headroom.
     """
+    return min(MAX_OUTPUT_TOKENS, OUTPUT_TOKENS_BASE + days * OUTPUT_TOKENS_PER_DAY)
+
+@lru_cache(maxsize=64)
+def _generation_configs(kind: str, days: int) -> tuple:
+    """
+    Generation configs per attempt (plain dicts, accepted by the SDK).
     
-    # Format interests as bullet points
-    interests_formatted = "\n".join([f"- {interest}" for interest in config.interests])
-    
-    # Build optional constraints text
-    optional_text = []
-    if config.optional_constraints.avoid_early_mornings:
-        optional_text.append("- Prefer late morning starts (after 9 AM)")
-    if config.optional_constraints.prefer_less_walking:
-        optional_text.append("- Minimize walking distances, suggest rest spots")
-    if config.optional_constraints.family_friendly:
-        optional_text.append("- Include family-friendly activities, kid-safe options")
-    if config.optional_constraints.vegetarian_friendly:
-        optional_text.append("- Prioritize vegetarian food options")
-    if config.optional_constraints.photography_focus:
-        optional_text.append("- Highlight photography opportunities and best times")
-    
-    optional_constraints_text = "\n".join(optional_text) if optional_text else "None"
-    
-    prompt = f"""You are a professional travel planner creating a detailed, structured itinerary.
+    The first attempt uses the adaptive budget; the retry uses the full
+    budget, so an answer cut off at the limit gets more room.
+    Cached, so each (kind, days) pair is built once and shared.
+    """
+    budgets = (output_token_budget(days), MAX_OUTPUT_TOKENS)
+    return tuple(
+        {
+            "temperature": temperature,
+            "max_output_tokens": budget,
+            "response_mime_type": "application/json",
+            "response_schema": _RESPONSE_SCHEMAS[kind],
+        }
+        for temperature, budget in zip(RETRY_TEMPERATURES, budgets)
+    )
+
+# ============================================================================
+# ENHANCED PROMPT CONSTRUCTION (v2.0) - FIXED
+# ============================================================================
+
+# Static prompt text, rendered with str.format_map; only the trip-specific
+# slots are filled per request. The scope slots (rules 1, 7, 8, the trip
+# part section and the closing line) differ between a whole itinerary and
+# one part of a long trip, so a part's prompt never asks for the whole trip
+_PROMPT_TEMPLATE = """You are a professional travel planner creating a detailed, structured itinerary.
 
 Generate a well-paced travel itinerary using these constraints:
 
 TRIP SUMMARY:
-- Source: {config.trip_summary.source}
-- Destination: {config.trip_summary.destination}
-- Duration: {config.trip_summary.days} days
-- Travel mode: {config.trip_summary.travel_mode}
-- Distance: {config.trip_summary.distance_km} km
+- Source: {source}
+- Destination: {destination}
+- Duration: {days} days
+- Travel mode: {travel_mode}
+- Distance: {distance_km} km
 
 TRAVEL STYLE:
-- Pace: {config.constraints.pace}
-- Target activities: {config.constraints.places_per_day} places per day (approximate)
-- Start time preference: {config.constraints.start_time} mornings
-- Budget level: {config.constraints.budget}
-- Experience style: {config.constraints.experience_style}
-- Comfort level: {config.constraints.comfort_level}
+- Pace: {pace}
+- Target activities: {places_per_day} places per day (approximate)
+- Start time preference: {start_time} mornings
+- Budget level: {budget}
+- Experience style: {experience_style}
+- Comfort level: {comfort_level}
 
 USER INTERESTS:
 {interests_formatted}
@@ -181,9 +326,9 @@ ADDITIONAL PREFERENCES:
 {optional_constraints_text}
 
 IMPORTANT INSTRUCTIONS:
-1. Create {config.trip_summary.days} days of activities
+1. {scope_rule}
 2. Each day should have 2-4 time blocks
-3. EVERY block must include a meal object, even if it's just {{"meal_type": "none"}}
+3. EVERY block must include a meal object (meal_type "none" if no meal)
 4. Add logistics hints for practical navigation
 5. Note photography opportunities if relevant
 6. Balance activity types across days
@@ -191,23 +336,8 @@ IMPORTANT INSTRUCTIONS:
 8. Align with the user's budget and comfort level
 
 ========================
-CRITICAL ENUM ENFORCEMENT (MANDATORY)
+CATEGORY MAPPING RULES
 ========================
-- You MUST use ONLY the allowed enum values listed below.
-- DO NOT invent or vary enum values.
-- If unsure, map activities using the mapping rules.
-
-Allowed activity_type values:
-sightseeing, culture, food, relaxation,
-adventure, shopping, beach, nature,
-history, art, music, sports
-
-Allowed period values:
-morning, afternoon, evening
-
-Allowed meal_type values:
-breakfast, lunch, dinner, none
-
 If an activity involves photography:
 - Use activity_type = sightseeing
 - Put photography details ONLY inside photography_note
@@ -222,84 +352,179 @@ For dining_style, use ONLY these normalized values:
 street, café, restaurant, beachside
 
 STRICT RULES:
-1. Respect the {config.constraints.places_per_day} places per day guideline
+1. Respect the {places_per_day} places per day guideline
 2. Do NOT invent travel routes, distances, or transportation details
 3. Do NOT mention specific hotel names or exact prices
-4. Keep activities realistic and achievable for {config.trip_summary.destination}
+4. Keep activities realistic and achievable for {destination}
 5. Consider travel time between activities
 6. Provide practical, actionable descriptions
-7. Return ONLY valid JSON - no markdown, no code blocks, no explanations
-8. NEVER set "meal" to null - always include a meal object
-9. STRICTLY FOLLOW the enum values above - NO EXCEPTIONS
-
-CRITICAL: You MUST use this exact JSON structure:
-
-{{
-  "destination": "{config.trip_summary.destination}",
-  "days": {config.trip_summary.days},
-  "overall_style": {{
-    "pace": "{config.constraints.pace}",
-    "budget": "{config.constraints.budget}"
-  }},
-  "itinerary": [
-    {{
-      "day": 1,
-      "day_theme": "Arrival & Exploration",
-      "day_summary": "Begin your journey with an introduction to the destination",
-      "blocks": [
-        {{
-          "period": "morning",
-          "time_window": "09:00–11:30",
-          "title": "Welcome Activity",
-          "activity_type": "sightseeing",
-          "description": "Start your trip with an introductory activity.",
-          "logistics_hint": "Optional practical tip",
-          "meal": {{
-            "meal_type": "breakfast",
-            "cuisine_type": "local",
-            "dining_style": "restaurant",
-            "veg_friendly": true
-          }},
-          "photography_note": "Optional photography suggestion"
-        }},
-        {{
-          "period": "afternoon",
-          "time_window": "13:00–15:30",
-          "title": "Cultural Experience",
-          "activity_type": "culture",
-          "description": "Explore local culture and traditions.",
-          "logistics_hint": "Optional practical tip",
-          "meal": {{
-            "meal_type": "lunch",
-            "cuisine_type": "local",
-            "dining_style": "restaurant",
-            "veg_friendly": true
-          }},
-          "photography_note": "Optional photography suggestion"
-        }},
-        {{
-          "period": "evening",
-          "time_window": "18:00–20:30",
-          "title": "Evening Relaxation",
-          "activity_type": "relaxation",
-          "description": "Wind down after a day of exploration.",
-          "logistics_hint": "Optional practical tip",
-          "meal": {{
-            "meal_type": "dinner",
-            "cuisine_type": "local",
-            "dining_style": "restaurant",
-            "veg_friendly": true
-          }},
-          "photography_note": "Optional photography suggestion"
-        }}
-      ]
-    }}
-  ]
-}}
-
-Generate the complete {config.trip_summary.days}-day itinerary now:"""
-    
-    return prompt
+7. {style_rule}
+8. {numbering_rule}
+{trip_part_section}
+{closing_line}"""
+
+# Optional constraint flag -> prompt line, in prompt order
+_OPTIONAL_CONSTRAINT_LINES = (
+    ("avoid_early_mornings", "- Prefer late morning starts (after 9 AM)"),
+    ("prefer_less_walking", "- Minimize walking distances, suggest rest spots"),
+    ("family_friendly", "- Include family-friendly activities, kid-safe options"),
+    ("vegetarian_friendly", "- Prioritize vegetarian food options"),
+    ("photography_focus", "- Highlight photography opportunities and best times"),
+)
+
+def _render_prompt(config: ItineraryRequest, scope: dict) -> str:
+    """
+    Fill the prompt template with the trip details and the given scope slots.
+    
+    Args:
+        config: Complete configuration from Module 5
+        scope: Values for scope_rule, style_rule, numbering_rule,
+            trip_part_section and closing_line
+    
+    Returns:
+        Formatted prompt string
+    """
+    # Format interests as bullet points
+    interests_formatted = "\n".join([f"- {interest}" for interest in config.interests])
+    
+    # Build optional constraints text
+    optional = config.optional_constraints
+    optional_text = [line for attr, line in _OPTIONAL_CONSTRAINT_LINES if getattr(optional, attr)]
+    optional_constraints_text = "\n".join(optional_text) if optional_text else "None"
+    
+    trip = config.trip_summary
+    constraints = config.constraints
+    return _PROMPT_TEMPLATE.format_map({
+        "source": trip.source,
+        "destination": trip.destination,
+        "days": trip.days,
+        "travel_mode": trip.travel_mode,
+        "distance_km": trip.distance_km,
+        "pace": constraints.pace,
+        "places_per_day": constraints.places_per_day,
+        "start_time": constraints.start_time,
+        "budget": constraints.budget,
+        "experience_style": constraints.experience_style,
+        "comfort_level": constraints.comfort_level,
+        "interests_formatted": interests_formatted,
+        "optional_constraints_text": optional_constraints_text,
+        **scope,
+    })
+
+def build_gemini_prompt(config: ItineraryRequest) -> str:
+    """
+    Construct enhanced Gemini prompt from Module 5 configuration.
+    
+    Enhanced design principles:
+    - Clear structure for AI understanding
+    - Output structure is enforced by ITINERARY_RESPONSE_SCHEMA, not the prompt
+    - Flexible time blocks instead of fixed periods
+    - Enhanced categorization and metadata
+    
+    Args:
+        config: Complete configuration from Module 5
+    
+    Returns:
+        Formatted prompt string
+    """
+    days = config.trip_summary.days
+    constraints = config.constraints
+    return _render_prompt(config, {
+        "scope_rule": f"Create {days} days of activities",
+        "style_rule": f'Set "overall_style" to pace "{constraints.pace}" and budget "{constraints.budget}"',
+        "numbering_rule": "Number days sequentially starting from 1",
+        "trip_part_section": "",
+        "closing_line": f"Generate the complete {days}-day itinerary now:",
+    })
+
+_SHARD_SECTION_TEMPLATE = """
+========================
+TRIP PART: DAYS {first_day}–{last_day} OF {days}
+========================
+This trip is planned in parts; other days are generated separately.
+{position_note}
+
+Main interest focus for each of these days:
+{day_focus}
+
+Earlier days of this trip:
+{prior_days}
+Do not repeat their highlight activities.
+"""
+
+def plan_day_focus(config: ItineraryRequest) -> list[str]:
+    """
+    Assign each day of the trip a main interest, rotating through the list.
+    
+    Parts of a long trip are generated concurrently, so they cannot see
+    each other's output; a shared plan gives every part the same view of
+    what the other days cover.
+    
+    Args:
+        config: Complete configuration from Module 5
+    
+    Returns:
+        Main interest per day (index 0 = day 1)
+    """
+    interests = config.interests or ["sightseeing"]
+    return [interests[i % len(interests)] for i in range(config.trip_summary.days)]
+
+def build_shard_prompt(
+    config: ItineraryRequest,
+    first_day: int,
+    last_day: int,
+    prior_day_themes: Optional[list[str]] = None
+) -> str:
+    """
+    Construct the prompt for a consecutive range of days of a long trip.
+    
+    The full trip context is kept so every part follows the same
+    constraints; the day-count, numbering and closing instructions only
+    cover the requested range.
+    
+    Args:
+        config: Complete configuration from Module 5
+        first_day: First day of the range (1-based)
+        last_day: Last day of the range (inclusive)
+        prior_day_themes: Focus of days 1..first_day-1 (defaults to
+            plan_day_focus)
+    
+    Returns:
+        Formatted prompt string
+    """
+    days = config.trip_summary.days
+    day_focus = plan_day_focus(config)
+    if prior_day_themes is None:
+        prior_day_themes = day_focus[:first_day - 1]
+    
+    if first_day == 1:
+        position_note = "Day 1 is the arrival day."
+    elif last_day == days:
+        position_note = f"Day {days} is the departure day."
+    else:
+        position_note = "These are middle days of the trip (no arrival or departure)."
+    
+    prior_days = "\n".join(
+        f"- Day {day}: {theme}" for day, theme in enumerate(prior_day_themes, start=1)
+    ) or "- None (these are the first days)"
+    
+    constraints = config.constraints
+    return _render_prompt(config, {
+        "scope_rule": f"Create activities for days {first_day}–{last_day} only",
+        "style_rule": f'Keep the "{constraints.pace}" pace and "{constraints.budget}" budget level on every day',
+        "numbering_rule": f"Number days {first_day} to {last_day} (their position in the full trip)",
+        "trip_part_section": _SHARD_SECTION_TEMPLATE.format(
+            first_day=first_day,
+            last_day=last_day,
+            days=days,
+            position_note=position_note,
+            day_focus="\n".join(
+                f"- Day {day}: {day_focus[day - 1]}" for day in range(first_day, last_day + 1)
+            ),
+            prior_days=prior_days,
+        ),
+        "closing_line": f'Generate days {first_day}–{last_day} now, as the "itinerary" list:',
+    })
 
 # ============================================================================
 # GEMINI RESPONSE EXTRACTION (UNCHANGED)
@@ -319,6 +544,14 @@ def safe_extract_text(response) -> Optional[str]:
     if not response or not hasattr(response, 'candidates'):
         return None
 
+    # Fast path: the usual shape is a single candidate with one text part
+    try:
+        text = response.candidates[0].content.parts[0].text.strip()
+        if text:
+            return text
+    except (AttributeError, IndexError, TypeError):
+        pass
+
     for candidate in response.candidates:
         content = getattr(candidate, "content", None)
         if not content:
@@ -332,6 +565,17 @@ def safe_extract_text(response) -> Optional[str]:
 
     return None
 
+def _hit_token_limit(response) -> bool:
+    """Whether generation stopped at max_output_tokens"""
+    try:
+        finish_reason = response.candidates[0].finish_reason
+    except (AttributeError, IndexError, TypeError):
+        return False
+    return getattr(finish_reason, "name", finish_reason) in ("MAX_TOKENS", 2)
+
+# Optional ``` / ```json opening fence, body, optional closing fence
+_FENCE_RE = re.compile(r"\s*```(?:json)?(.*?)(?:```)?\s*\Z", re.DOTALL)
+
 def clean_json_response(raw_text: str) -> str:
     """
     Clean JSON response by removing markdown formatting.
@@ -347,124 +591,233 @@ def clean_json_response(raw_text: str) -> str:
     Returns:
         Cleaned JSON string
     """
-    text = raw_text.strip()
+    match = _FENCE_RE.match(raw_text)
+    return match.group(1).strip() if match else raw_text.strip()
+
+def _drop_trailing_comma(out: list[str]) -> None:
+    """Remove a comma (and whitespace after it) at the end of out."""
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i:]
+
+def repair_json_text(text: str) -> str:
+    """
+    Repair common LLM JSON defects without another model call.
     
-    # Remove markdown code blocks
-    if text.startswith("```json"):
-        text = text[7:]
-    elif text.startswith("```"):
-        text = text[3:]
+    Handles:
+    - Trailing commas before } or ]
+    - Output truncated mid-string or with unclosed objects/arrays
     
-    if text.endswith("```"):
-        text = text[:-3]
+    Args:
+        text: JSON text that failed to parse
+    
+    Returns:
+        Repaired JSON text (may still be invalid)
+    """
+    out: list[str] = []
+    closers: list[str] = []
+    in_string = escaped = False
     
-    return text.strip()
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            closers.append("}")
+        elif ch == "[":
+            closers.append("]")
+        elif ch in "}]":
+            _drop_trailing_comma(out)
+            if closers:
+                closers.pop()
+        out.append(ch)
+    
+    if in_string:
+        out.append('"')
+    _drop_trailing_comma(out)
+    out.extend(reversed(closers))
+    return "".join(out)
 
 # ============================================================================
-# ENHANCED VALIDATION LOGIC (v2.0) - FIXED
+# RESPONSE CACHE
 # ============================================================================
 
-def validate_itinerary_structure(data: dict, expected_days: int) -> bool:
+def itinerary_cache_key(config: ItineraryRequest) -> str:
     """
-    Validate enhanced itinerary JSON structure.
+    Canonical hash of a request configuration.
+    
+    Field order in model_dump_json is fixed by the model definitions, so
+    equal configurations always serialize identically. ai_model is part
+    of the key, so switching models never serves another model's output.
+    
+    Args:
+        config: Complete configuration from Module 5
     
-    Enhanced checks:
-    - Overall style present
-    - Each day has theme, summary, and flexible blocks
-    - Block structure with proper types
-    - Meal information when present
+    Returns:
+        Hex digest identifying the configuration
+    """
+    return hashlib.blake2b(config.model_dump_json().encode(), digest_size=16).hexdigest()
+
+# ============================================================================
+# GEMINI CALLS
+# ============================================================================
+
+async def _generate_validated(model, prompt: str, generation_config: dict,
+                              adapter: TypeAdapter, context: dict):
+    """
+    Call Gemini in JSON mode and validate the reply with a TypeAdapter.
     
     Args:
-        data: Parsed JSON dictionary
-        expected_days: Expected number of days from config
+        model: GenerativeModel to call
+        prompt: Prompt text
+        generation_config: JSON-mode generation config
+        adapter: TypeAdapter for the expected model
+        context: Validation context (expected day numbering)
     
     Returns:
-        True if valid, False otherwise
+        Validated model instance
+    
+    Raises:
+        ValueError: Empty, malformed or schema-invalid response
     """
+    # Async call: the event loop keeps serving other requests
+    # during the multi-second Gemini round trip
+    async with gemini_semaphore:
+        response = await model.generate_content_async(
+            prompt,
+            generation_config=generation_config,
+        )
+    
+    raw_text = safe_extract_text(response)
+    logger.debug("Raw Gemini response preview: %.500s", raw_text)
+    if not raw_text:
+        raise ValueError("Gemini returned empty response")
+    if _hit_token_limit(response):
+        # Don't repair a cut-off answer into a shorter itinerary; let the
+        # retry run with the full budget instead
+        raise ValueError("AI response was cut off at the output token limit")
+    
+    # JSON mode returns bare JSON; fences are stripped only if the model added them anyway
+    cleaned_text = clean_json_response(raw_text)
+    
+    # Parse and validate in one pass in pydantic-core. Null meals are
+    # normalized by ItineraryBlock's meal validator; enums and required
+    # fields are enforced by the Literal annotations
     try:
-        # Check top-level fields
-        required_top_fields = ["destination", "days", "overall_style", "itinerary"]
-        if not all(key in data for key in required_top_fields):
-            return False
-        
-        # Check days count
-        if data["days"] != expected_days:
-            return False
-        
-        # Check overall_style structure
-        overall_style = data.get("overall_style", {})
-        if not isinstance(overall_style, dict):
-            return False
-        if not all(key in overall_style for key in ["pace", "budget"]):
-            return False
-        
-        # Check itinerary array
-        itinerary = data.get("itinerary", [])
-        if len(itinerary) != expected_days:
-            return False
-        
-        # Valid period values (STRICT - only these three)
-        valid_periods = {"morning", "afternoon", "evening"}
-        
-        # Valid activity types (STRICT - only these)
-        valid_activity_types = {"sightseeing", "culture", "food", "relaxation", 
-                               "adventure", "shopping", "beach", "nature", 
-                               "history", "art", "music", "sports"}
-        
-        # Check each day structure
-        for day_idx, day_data in enumerate(itinerary):
-            # Check day number is sequential
-            if day_data.get("day") != day_idx + 1:
-                return False
-            
-            # Check required day fields
-            required_day_fields = ["day", "day_theme", "day_summary", "blocks"]
-            if not all(field in day_data for field in required_day_fields):
-                return False
-            
-            # Check blocks is a list
-            blocks = day_data.get("blocks", [])
-            if not isinstance(blocks, list):
-                return False
-            
-            # Ensure at least 1 block per day (more flexible)
-            if len(blocks) < 1:
-                return False
-            
-            # Check each block structure
-            for block in blocks:
-                # Required block fields
-                required_block_fields = ["period", "time_window", "title", 
-                                       "activity_type", "description"]
-                if not all(field in block for field in required_block_fields):
-                    return False
-                
-                # Validate period value (STRICT)
-                if block["period"] not in valid_periods:
-                    print(f"Invalid period: {block['period']}. Must be one of {valid_periods}")
-                    return False
-                
-                # Validate activity_type value (STRICT)
-                if block["activity_type"] not in valid_activity_types:
-                    print(f"Invalid activity_type: {block['activity_type']}. Must be one of {valid_activity_types}")
-                    return False
-                
-                # Ensure meal field exists (even if null, our validator will fix it)
-                if "meal" not in block:
-                    block["meal"] = {"meal_type": "none"}
-        
-        return True
+        return adapter.validate_json(cleaned_text, context=context)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
     
-    except Exception as e:
-        print(f"Validation error: {e}")
-        return False
+    if errors and errors[0]["type"] == "json_invalid":
+        # Try an in-process repair before paying for another Gemini call
+        try:
+            return adapter.validate_json(repair_json_text(cleaned_text), context=context)
+        except ValidationError:
+            logger.warning("❌ JSON parsing failed: %s. Raw response preview: %.500s", errors[0]["msg"], raw_text)
+            raise ValueError(f"Invalid JSON response from AI: {errors[0]['msg']}")
+    
+    summary = "; ".join(
+        f"{'.'.join(map(str, err['loc'])) or 'response'}: {err['msg']}" for err in errors[:3]
+    )
+    raise ValueError(f"AI response failed schema validation: {summary}")
+
+async def _generate_with_retry(model, prompt: str, generation_configs: tuple,
+                               adapter: TypeAdapter, context: dict, label: str):
+    """
+    Run _generate_validated, retrying a failed attempt once.
+    
+    The retry uses a lower temperature and reminds the model to return
+    valid JSON.
+    
+    Args:
+        model: GenerativeModel to call
+        prompt: Prompt text
+        generation_configs: Generation configs for the attempt and the retry
+        adapter: TypeAdapter for the expected model
+        context: Validation context (expected day numbering)
+        label: What is being generated, for log messages
+    
+    Returns:
+        Validated model instance
+    
+    Raises:
+        ValueError: Both attempts failed
+    """
+    for attempt, generation_config in enumerate(generation_configs):
+        try:
+            return await _generate_validated(
+                model, prompt if attempt == 0 else prompt + RETRY_PROMPT_SUFFIX,
+                generation_config, adapter, context
+            )
+        except ValueError as e:
+            logger.warning("⚠️ %s failed at temperature %s: %s", label, generation_config["temperature"], e)
+            error = e
+    raise error
+
+async def _generate_shard(model, config: ItineraryRequest, first_day: int, last_day: int) -> list[DayPlan]:
+    """
+    Generate days first_day..last_day of a long trip.
+    
+    Args:
+        model: GenerativeModel to call
+        config: Complete configuration from Module 5
+        first_day: First day of the range (1-based)
+        last_day: Last day of the range (inclusive)
+    
+    Returns:
+        DayPlans for the range, in order
+    
+    Raises:
+        ValueError: Generation failed after retrying
+    """
+    shard = await _generate_with_retry(
+        model, build_shard_prompt(config, first_day, last_day),
+        _generation_configs("shard", last_day - first_day + 1), _SHARD_ADAPTER,
+        context={"day_range": (first_day, last_day)},
+        label=f"Itinerary days {first_day}–{last_day}",
+    )
+    return shard.itinerary
+
+async def _gather_or_cancel(coros) -> list:
+    """
+    Run coroutines concurrently, cancelling the rest as soon as one fails.
+    
+    Unlike asyncio.gather, a failure doesn't leave the other Gemini calls
+    running (and holding semaphore slots) for a request that already failed.
+    
+    Args:
+        coros: Coroutines to run
+    
+    Returns:
+        Results in the same order as coros
+    
+    Raises:
+        The first exception raised by any coroutine
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(coro) for coro in coros]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [task.result() for task in tasks]
 
 # ============================================================================
 # MAIN GENERATION ENDPOINT (UPDATED FOR v2.0) - FIXED
 # ============================================================================
 
 @router.post("/api/itinerary", response_model=ItineraryResponse)
-async def generate_itinerary(config: ItineraryRequest):
+async def generate_itinerary(
+    config: ItineraryRequest,
+    regenerate: bool = Query(False, description="Skip the cached itinerary and generate a new one")
+):
     """
     Generate AI-powered itinerary from Module 5 configuration.
     
@@ -477,8 +830,12 @@ async def generate_itinerary(config: ItineraryRequest):
     4. Validate enhanced JSON structure
     5. Return structured itinerary with flexible blocks
     
+    Trips longer than ITINERARY_SHARD_DAYS are generated as concurrent
+    day ranges and assembled into one itinerary.
+    
     Args:
         config: Complete configuration from Module 5
+        regenerate: Generate a new itinerary even if one is cached
     
     Returns:
         ItineraryResponse with enhanced structured itinerary
@@ -486,76 +843,109 @@ async def generate_itinerary(config: ItineraryRequest):
     Raises:
         HTTPException 500: AI generation or parsing failed
     """
+    # Already validated: serialize directly instead of letting FastAPI
+    # re-validate against response_model (kept for the OpenAPI docs)
+    body = await _generate_itinerary_json(config, regenerate)
+    return Response(content=body, media_type="application/json")
+
+@router.post("/api/itinerary/batch", response_model=list[ItineraryResponse])
+async def generate_itinerary_batch(
+    configs: list[ItineraryRequest],
+    regenerate: bool = Query(False, description="Skip cached itineraries and generate new ones")
+):
+    """
+    Generate several itineraries (e.g. pace or destination variants) at once.
     
-    try:
-        # ====================================================================
-        # STEP 1: BUILD ENHANCED PROMPT
-        # ====================================================================
-        prompt = build_gemini_prompt(config)
-        
-        # ====================================================================
-        # STEP 2: CALL GEMINI API
-        # ====================================================================
-        model = genai.GenerativeModel(config.ai_model)
-        
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.7,  # Balanced creativity
-                max_output_tokens=10000,  # Increased for detailed blocks
-            ),
+    All itineraries are generated concurrently; Gemini calls still share
+    the per-worker concurrency cap, so total latency is close to the
+    slowest single itinerary rather than the sum.
+    
+    Args:
+        configs: Up to MAX_BATCH_SIZE configurations from Module 5
+        regenerate: Generate new itineraries even if some are cached
+    
+    Returns:
+        List of ItineraryResponse, in request order
+    
+    Raises:
+        HTTPException 400: Empty or oversized batch
+        HTTPException 500: Any itinerary failed to generate
+    """
+    if not configs or len(configs) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch must contain 1-{MAX_BATCH_SIZE} configurations"
         )
-        
-        # ====================================================================
-        # STEP 3: EXTRACT TEXT
-        # ====================================================================
-        raw_text = safe_extract_text(response)
-        print("==================================")
-        print("Raw Gemini Response Preview:")
-        print(raw_text)  # Print first 500 chars for debugging
-        print("==================================")
-        if not raw_text:
-            raise ValueError("Gemini returned empty response")
-        
-        # ====================================================================
-        # STEP 4: CLEAN AND PARSE JSON
-        # ====================================================================
-        cleaned_text = clean_json_response(raw_text)
-        
-        try:
-            itinerary_data = json.loads(cleaned_text)
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON parsing failed: {e}")
-            print(f"Raw response preview: {raw_text[:500]}")
-            raise ValueError(f"Invalid JSON response from AI: {str(e)}")
-        
+    
+    bodies = await _gather_or_cancel([_generate_itinerary_json(config, regenerate) for config in configs])
+    return Response(content=b"[" + b",".join(bodies) + b"]", media_type="application/json")
+
+async def _generate_itinerary_json(config: ItineraryRequest, regenerate: bool = False) -> bytes:
+    """
+    Generate (or reuse from cache) one itinerary as serialized JSON.
+    
+    A regenerated itinerary replaces the cached one, so later plain
+    requests return the newest result.
+    
+    Args:
+        config: Complete configuration from Module 5
+        regenerate: Skip the cache lookup and always call Gemini
+    
+    Returns:
+        ItineraryResponse encoded as JSON bytes
+    
+    Raises:
+        HTTPException 500: AI generation or parsing failed
+    """
+    # Identical configurations (same model included) reuse a recent result,
+    # unless the user explicitly asked for a different itinerary
+    cache_key = itinerary_cache_key(config)
+    if not regenerate:
+        cached = _itinerary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    try:
         # ====================================================================
-        # STEP 5: VALIDATE AND FIX STRUCTURE
+        # STEP 1-4: PROMPT, CALL GEMINI, PARSE AND VALIDATE
         # ====================================================================
-        # First, fix any null meals in the data before validation
-        def fix_null_meals(data):
-            if isinstance(data, dict):
-                # Fix meal if it's null
-                if "meal" in data and data["meal"] is None:
-                    data["meal"] = {"meal_type": "none", "cuisine_type": "local", "dining_style": "restaurant", "veg_friendly": True}
-                # Recursively check nested structures
-                for key, value in data.items():
-                    if isinstance(value, (dict, list)):
-                        fix_null_meals(value)
-            elif isinstance(data, list):
-                for item in data:
-                    fix_null_meals(item)
-        
-        fix_null_meals(itinerary_data)
+        model = get_model(config.ai_model)
+        days = config.trip_summary.days
         
-        # Now validate
-        if not validate_itinerary_structure(itinerary_data, config.trip_summary.days):
-            raise ValueError("AI response missing required fields or incorrect structure")
+        if days <= ITINERARY_SHARD_DAYS:
+            itinerary = await _generate_with_retry(
+                model, build_gemini_prompt(config), _generation_configs("itinerary", days), _ITINERARY_ADAPTER,
+                context={"expected_days": days},
+                label="Itinerary",
+            )
+        else:
+            # Long trips: generate day ranges concurrently, so latency follows
+            # the slowest part instead of one huge response
+            ranges = [
+                (first, min(first + ITINERARY_SHARD_DAYS - 1, days))
+                for first in range(1, days + 1, ITINERARY_SHARD_DAYS)
+            ]
+            shards = await _gather_or_cancel([
+                _generate_shard(model, config, first, last) for first, last in ranges
+            ])
+            # Every DayPlan was validated with its shard, and the ranges
+            # cover 1..days in order, so assemble without revalidating
+            itinerary = ItineraryResponse.model_construct(
+                destination=config.trip_summary.destination,
+                days=days,
+                overall_style=OverallStyle.model_construct(
+                    pace=config.constraints.pace,
+                    budget=config.constraints.budget,
+                ),
+                itinerary=[day for shard in shards for day in shard],
+            )
         
         # ====================================================================
-        # STEP 6: RETURN VALIDATED RESPONSE
+        # STEP 5: SERIALIZE AND CACHE VALIDATED RESPONSE
         # ====================================================================
-        return ItineraryResponse(**itinerary_data)
+        body = _ITINERARY_ADAPTER.dump_json(itinerary)
+        _itinerary_cache.set(cache_key, body)
+        return body
     
     except ValueError as e:
         # User-facing error for AI failures
@@ -566,7 +956,7 @@ async def generate_itinerary(config: ItineraryRequest):
     
     except Exception as e:
         # Catch-all for unexpected errors
-        print(f"🔥 Unexpected error in itinerary generation: {e}")
+        logger.exception("🔥 Unexpected error in itinerary generation: %s", e)
         raise HTTPException(
             status_code=500,
             detail="An unexpected error occurred during itinerary generation. Please try again."
@@ -596,7 +986,7 @@ async def itinerary_health():
             "gemini-flash-latest",
             "gemini-2.5-flash"
         ],
-        "max_days": 30,
+        "max_days": MAX_TRIP_DAYS,
         "dependencies": ["Module 5 configuration"]
     }
 
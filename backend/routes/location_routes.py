@@ -16,15 +16,18 @@ For dynamic geocoding, consider:
 - Photon API (allows autocomplete)
 """
 
-from fastapi import APIRouter, Query, HTTPException
-from typing import List, Dict
+from fastapi import APIRouter, Query, HTTPException, Response
+from typing import List, Dict, Optional
 from data.cities import (
     search_cities,
     get_city_by_name,
+    get_cities_within,
+    get_nearest_cities,
     get_stats,
     validate_city_exists,
     INDIAN_CITIES
 )
+from utils.responses import encode_static, static_json_response
 
 router = APIRouter()
 
@@ -133,8 +136,54 @@ async def get_city_details(city_name: str) -> Dict:
     return city
 
 
+@router.get("/api/locations/nearby")
+async def get_nearby_locations(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    limit: int = Query(5, ge=1, le=20, description="Maximum results"),
+    radius_km: Optional[float] = Query(None, gt=0, le=1000, description="Only cities within this radius")
+) -> List[Dict]:
+    """
+    Get the cities nearest to a coordinate
+    
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        limit: Maximum results to return (default 5)
+        radius_km: Optional search radius; uses the spatial grid index
+    
+    Returns:
+        List of cities with distance_km, nearest first
+    
+    Example:
+        GET /api/locations/nearby?lat=15.49&lon=73.82
+        GET /api/locations/nearby?lat=15.49&lon=73.82&radius_km=100
+        Returns: Panaji, Goa, etc.
+    """
+    if radius_km is not None:
+        return get_cities_within(lat, lon, radius_km, limit=limit)
+    return get_nearest_cities(lat, lon, limit=limit)
+
+
+# Stats and health payloads depend only on the static city list
+_STATS_BODY = encode_static({
+    "status": "ok",
+    "method": "static_database",
+    **get_stats()
+})
+
+_HEALTH_BODY = encode_static({
+    "status": "ok",
+    "service": "location_discovery",
+    "method": "static_database",
+    "data_source": "data/cities.py",
+    "total_cities": get_stats()["total_cities"],
+    "ready": True
+})
+
+
 @router.get("/api/locations/stats")
-async def get_location_stats() -> Dict:
+async def get_location_stats() -> Response:
     """
     Get statistics about the city database
     
@@ -144,44 +193,36 @@ async def get_location_stats() -> Dict:
     Example:
         GET /api/locations/stats
     """
-    return {
-        "status": "ok",
-        "method": "static_database",
-        **get_stats()
-    }
+    return static_json_response(_STATS_BODY)
 
 
 @router.get("/api/locations/health")
-async def location_health() -> Dict:
+async def location_health() -> Response:
     """
     Health check for location service
     
     Returns:
         Service health status
     """
-    stats = get_stats()
-    return {
-        "status": "ok",
-        "service": "location_discovery",
-        "method": "static_database",
-        "data_source": "data/cities.py",
-        "total_cities": stats["total_cities"],
-        "ready": True
-    }
+    return static_json_response(_HEALTH_BODY)
 
 
 # === OPTIONAL DEBUG ENDPOINTS ===
 # Remove these in production or protect with authentication
 
+# The city list is static, so the full response body is encoded once
+_ALL_LOCATIONS_BODY = encode_static({
+    "cities": INDIAN_CITIES,
+    "count": len(INDIAN_CITIES),
+    "stats": get_stats()
+})
+
+
 @router.get("/api/locations/all")
-async def get_all_locations() -> Dict:
+async def get_all_locations() -> Response:
     """
     Get all available cities (debug endpoint)
     
     **Note:** Consider paginating this in production
     """
-    return {
-        "cities": INDIAN_CITIES,
-        "count": len(INDIAN_CITIES),
-        "stats": get_stats()
-    }
\ No newline at end of file
+    return static_json_response(_ALL_LOCATIONS_BODY)
\ No newline at end of file
@@ -11,11 +11,16 @@ REFACTORED: Now integrates with centralized city database
 NO AI MODELS | NO EXTERNAL APIS | PURE LOGIC
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Union
-from data.cities import get_city_by_name, validate_city_exists
-from utils.distance import calculate_distance, calculate_minimum_days
+from fastapi import APIRouter, HTTPException, Path, Response
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional, Tuple, Union
+from data.cities import get_city_distance, get_city_record
+from utils.distance import (
+    calculate_distance,
+    haversine_all,
+    is_route_feasible
+)
+from utils.responses import encode_static, static_json_response
 
 router = APIRouter()
 
@@ -37,6 +42,9 @@ class RouteValidationRequest(BaseModel):
     1. City names (recommended): Validates against database
     2. Raw coordinates: For custom locations
     """
+    # City names are trimmed during parsing, no Python validator needed
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
     # Option 1: City names (recommended)
     source_city: Optional[str] = Field(None, description="Source city name")
     destination_city: Optional[str] = Field(None, description="Destination city name")
@@ -47,13 +55,17 @@ class RouteValidationRequest(BaseModel):
     
     days: int = Field(..., ge=1, le=30, description="Trip duration in days")
     
-    @field_validator('source_city', 'destination_city')
-    @classmethod
-    def validate_city_name(cls, v):
-        """Trim whitespace from city names"""
-        if v:
-            return v.strip()
-        return v
+    @model_validator(mode='after')
+    def check_input_mode(self):
+        """Require a complete pair of city names or of coordinates"""
+        has_cities = bool(self.source_city and self.destination_city)
+        has_coords = self.source is not None and self.destination is not None
+        if not (has_cities or has_coords):
+            raise ValueError(
+                "Provide either (source_city + destination_city) OR (source + destination coordinates). "
+                "Do not mix both formats."
+            )
+        return self
 
 
 class RouteValidationResponse(BaseModel):
@@ -66,6 +78,97 @@ class RouteValidationResponse(BaseModel):
     reason: Optional[str] = None
 
 
+class BulkRouteValidationRequest(BaseModel):
+    """Request to validate one source city against many destination cities"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    source_city: str = Field(..., description="Source city name")
+    destination_cities: List[str] = Field(
+        ..., min_length=1, max_length=50, description="Destination city names"
+    )
+    days: int = Field(..., ge=1, le=30, description="Trip duration in days")
+
+
+class BulkRouteValidationResponse(BaseModel):
+    """Feasibility analysis for each destination, in request order"""
+    source_city: str
+    days: int
+    results: List[RouteValidationResponse]
+
+
+# ============================================================================
+# SHARED HANDLER LOGIC
+# ============================================================================
+
+def resolve_city_distance(source_city: str, destination_city: str) -> Tuple[int, str, str]:
+    """
+    Look up both cities and the distance between them.
+    
+    Shared by the route validation and travel mode endpoints, so both
+    report unknown cities the same way.
+    
+    Args:
+        source_city: Source city name (case-insensitive)
+        destination_city: Destination city name (case-insensitive)
+    
+    Returns:
+        Tuple of (distance_km, source city name, destination city name)
+    
+    Raises:
+        HTTPException 400: City not found
+    """
+    # Look up each city once; None means it is not in the database
+    source = get_city_record(source_city)
+    if source is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Source city '{source_city}' not found in database. "
+                   "Please use /api/locations/search to find valid cities."
+        )
+    
+    dest = get_city_record(destination_city)
+    if dest is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Destination city '{destination_city}' not found in database. "
+                   "Please use /api/locations/search to find valid cities."
+        )
+    
+    # The distance comes from the precomputed matrix
+    return get_city_distance(source.name, dest.name), source.name, dest.name
+
+
+def _build_feasibility_response(
+    distance_km: int,
+    days: int,
+    source_city_name: Optional[str] = None,
+    destination_city_name: Optional[str] = None
+) -> RouteValidationResponse:
+    """
+    Apply the feasibility rules to a distance and build the response.
+    
+    Args:
+        distance_km: Distance in kilometers
+        days: Trip duration in days
+        source_city_name: Canonical source city name (city input only)
+        destination_city_name: Canonical destination city name (city input only)
+    
+    Returns:
+        RouteValidationResponse
+    """
+    feasible, minimum_days, reason = is_route_feasible(distance_km, days)
+    
+    # Every field is computed here with the declared type, so skip validation
+    return RouteValidationResponse.model_construct(
+        feasible=feasible,
+        distance_km=distance_km,
+        minimum_days=minimum_days,
+        source_city=source_city_name,
+        destination_city=destination_city_name,
+        reason=reason or None
+    )
+
+
 # ============================================================================
 # VALIDATION ENDPOINT
 # ============================================================================
@@ -87,6 +190,7 @@ async def validate_route(request: RouteValidationRequest):
     
     **Validation logic:**
     - Calculates distance using Haversine formula
+      (precomputed for city pairs)
     - Applies India-specific feasibility rules
     - Returns minimum recommended days
     
@@ -97,92 +201,85 @@ async def validate_route(request: RouteValidationRequest):
         RouteValidationResponse with feasibility status
     
     Raises:
-        HTTPException 400: Invalid input or city not found
+        HTTPException 400: City not found
+        (missing or mixed input is rejected with 422 while parsing the request)
     """
-    
-    source_lat = source_lon = dest_lat = dest_lon = None
-    source_city_name = destination_city_name = None
-    
-    # ========================================================================
-    # INPUT VALIDATION: City names OR coordinates must be provided
-    # ========================================================================
-    
     # Case 1: City names provided (recommended path)
     if request.source_city and request.destination_city:
-        # Validate source city
-        if not validate_city_exists(request.source_city):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Source city '{request.source_city}' not found in database. "
-                       "Please use /api/locations/search to find valid cities."
-            )
-        
-        # Validate destination city
-        if not validate_city_exists(request.destination_city):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Destination city '{request.destination_city}' not found in database. "
-                       "Please use /api/locations/search to find valid cities."
-            )
-        
-        # Get city data
-        source_city = get_city_by_name(request.source_city)
-        dest_city = get_city_by_name(request.destination_city)
-        
-        source_lat = source_city["lat"]
-        source_lon = source_city["lon"]
-        dest_lat = dest_city["lat"]
-        dest_lon = dest_city["lon"]
-        source_city_name = source_city["name"]
-        destination_city_name = dest_city["name"]
+        distance_km, source_city_name, destination_city_name = resolve_city_distance(
+            request.source_city, request.destination_city
+        )
+        return _build_feasibility_response(
+            distance_km, request.days, source_city_name, destination_city_name
+        )
     
     # Case 2: Raw coordinates provided (fallback)
-    elif request.source and request.destination:
-        source_lat = request.source.lat
-        source_lon = request.source.lon
-        dest_lat = request.destination.lat
-        dest_lon = request.destination.lon
-    
-    # Case 3: Mixed or missing input - ERROR
-    else:
+    distance_km = calculate_distance(
+        request.source.lat, request.source.lon,
+        request.destination.lat, request.destination.lon
+    )
+    return _build_feasibility_response(distance_km, request.days)
+
+
+# ============================================================================
+# BULK ENDPOINT: One source, many destinations
+# ============================================================================
+
+@router.post("/api/route/validate_bulk", response_model=BulkRouteValidationResponse)
+async def validate_route_bulk(request: BulkRouteValidationRequest):
+    """
+    Validate trip feasibility from one source city to many destinations.
+    
+    All distances are computed in a single pass from the source
+    (haversine_all), instead of one calculate_distance call per pair.
+    Same feasibility rules and rounding as /api/route/validate.
+    
+    Args:
+        request: Source city, destination cities and trip duration
+    
+    Returns:
+        BulkRouteValidationResponse with one result per destination
+    
+    Raises:
+        HTTPException 400: Source or any destination city not found
+    """
+    source_city = get_city_record(request.source_city)
+    if not source_city:
         raise HTTPException(
             status_code=400,
-            detail="Provide either (source_city + destination_city) OR (source + destination coordinates). "
-                   "Do not mix both formats."
+            detail=f"Source city '{request.source_city}' not found in database. "
+                   "Please use /api/locations/search to find valid cities."
         )
     
-    # ========================================================================
-    # DISTANCE CALCULATION
-    # ========================================================================
-    
-    distance_km = calculate_distance(source_lat, source_lon, dest_lat, dest_lon)
-    
-    # ========================================================================
-    # FEASIBILITY CHECK
-    # ========================================================================
+    dest_cities = []
+    for name in request.destination_cities:
+        dest_city = get_city_record(name)
+        if not dest_city:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Destination city '{name}' not found in database. "
+                       "Please use /api/locations/search to find valid cities."
+            )
+        dest_cities.append(dest_city)
     
-    minimum_days = calculate_minimum_days(distance_km)
-    feasible = request.days >= minimum_days
+    distances = haversine_all(
+        source_city.lat, source_city.lon,
+        [city.lat for city in dest_cities],
+        [city.lon for city in dest_cities]
+    )
     
-    # Generate reason if not feasible
-    reason = None
-    if not feasible:
-        reason = (
-            f"Distance too long for selected trip duration. "
-            f"Recommended minimum is {minimum_days} days for a {distance_km}km journey."
+    results = [
+        _build_feasibility_response(
+            round(distance), request.days, source_city.name, dest_city.name
         )
+        for dest_city, distance in zip(dest_cities, distances)
+    ]
     
-    # ========================================================================
-    # RESPONSE
-    # ========================================================================
-    
-    return RouteValidationResponse(
-        feasible=feasible,
-        distance_km=distance_km,
-        minimum_days=minimum_days,
-        source_city=source_city_name,
-        destination_city=destination_city_name,
-        reason=reason
+    # Results were built by _build_feasibility_response; skip revalidating them
+    return BulkRouteValidationResponse.model_construct(
+        source_city=source_city.name,
+        days=request.days,
+        results=results
     )
 
 
@@ -194,11 +291,14 @@ async def validate_route(request: RouteValidationRequest):
 async def validate_route_simple(
     source_city: str,
     destination_city: str,
-    days: int
+    days: int = Path(..., ge=1, le=30, description="Trip duration in days")
 ) -> RouteValidationResponse:
     """
     Simplified GET endpoint for quick route validation
     
+    Path parameters are validated by FastAPI directly, so no
+    RouteValidationRequest is built for this endpoint.
+    
     Example:
         GET /api/route/validate/Mumbai/Goa/3
     
@@ -210,34 +310,38 @@ async def validate_route_simple(
     Returns:
         RouteValidationResponse
     """
-    request = RouteValidationRequest(
-        source_city=source_city,
-        destination_city=destination_city,
-        days=days
+    distance_km, source_city_name, destination_city_name = resolve_city_distance(
+        source_city.strip(), destination_city.strip()
+    )
+    return _build_feasibility_response(
+        distance_km, days, source_city_name, destination_city_name
     )
-    return await validate_route(request)
 
 
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
 
+# Static payload, encoded once
+_HEALTH_BODY = encode_static({
+    "status": "ok",
+    "service": "route_feasibility",
+    "method": "haversine",
+    "data_source": "data/cities.py",
+    "input_modes": ["city_names", "raw_coordinates"],
+    "rules": {
+        "0-300km": "2 days",
+        "300-700km": "3 days",
+        "700-1200km": "4 days",
+        ">1200km": "5 days"
+    }
+})
+
+
 @router.get("/api/route/health")
-async def route_health():
+async def route_health() -> Response:
     """Health check for route validation service"""
-    return {
-        "status": "ok",
-        "service": "route_feasibility",
-        "method": "haversine",
-        "data_source": "data/cities.py",
-        "input_modes": ["city_names", "raw_coordinates"],
-        "rules": {
-            "0-300km": "2 days",
-            "300-700km": "3 days",
-            "700-1200km": "4 days",
-            ">1200km": "5 days"
-        }
-    }
+    return static_json_response(_HEALTH_BODY)
 
 
 # ============================================================================
@@ -325,10 +429,29 @@ Response: 400 Bad Request
 
 ---
 
+Example 6: Bulk validation (one source, many destinations)
+POST /api/route/validate_bulk
+{
+  "source_city": "Delhi",
+  "destination_cities": ["Agra", "Bangalore"],
+  "days": 2
+}
+Response:
+{
+  "source_city": "Delhi",
+  "days": 2,
+  "results": [
+    {"feasible": true, "distance_km": 192, "minimum_days": 2, "source_city": "Delhi", "destination_city": "Agra", "reason": null},
+    {"feasible": false, "distance_km": 1750, "minimum_days": 5, "source_city": "Delhi", "destination_city": "Bangalore", "reason": "Distance too long for selected trip duration. Recommended minimum is 5 days for a 1750km journey."}
+  ]
+}
+
+---
+
 BACKWARD COMPATIBLE (Raw Coordinates)
 ======================================
 
-Example 6: Raw coordinates (still works)
+Example 7: Raw coordinates (still works)
 POST /api/route/validate
 {
   "source": {"lat": 28.7041, "lon": 77.1025},
@@ -11,18 +11,22 @@ REFACTORED: Now integrates with centralized city database
 NO AI MODELS | NO EXTERNAL APIS | PURE LOGIC
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Dict
+from bisect import bisect_left
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, Path, Response
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Optional, List, Dict, Tuple
 from enum import Enum
-from data.cities import get_city_by_name, validate_city_exists
-from utils.distance import calculate_distance
+from routes.route_validation import resolve_city_distance
+from utils.distance import DISTANCE_BANDS_KM
 from utils.travel_time import (
+    calculate_all_travel_times,
     calculate_travel_time,
     format_travel_time,
     TravelMode,
     SPEED_CONFIG
 )
+from utils.responses import encode_static, static_json_response
 
 router = APIRouter()
 
@@ -38,6 +42,9 @@ class TravelModeRequest(BaseModel):
     1. City names (recommended): Auto-calculates distance
     2. Raw distance: For pre-calculated distances
     """
+    # City names are trimmed during parsing, no Python validator needed
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
     # Option 1: City names (recommended)
     source_city: Optional[str] = Field(None, description="Source city name")
     destination_city: Optional[str] = Field(None, description="Destination city name")
@@ -48,13 +55,15 @@ class TravelModeRequest(BaseModel):
     days: int = Field(..., ge=1, le=30, description="Trip duration in days")
     preferred_mode: Optional[TravelMode] = Field(None, description="User's preferred travel mode")
     
-    @field_validator('source_city', 'destination_city')
-    @classmethod
-    def validate_city_name(cls, v):
-        """Trim whitespace from city names"""
-        if v:
-            return v.strip()
-        return v
+    @model_validator(mode='after')
+    def check_input_mode(self):
+        """Require a pair of city names or a raw distance"""
+        if not (self.source_city and self.destination_city) and self.distance_km is None:
+            raise ValueError(
+                "Provide either (source_city + destination_city) OR distance_km. "
+                "Do not mix both formats."
+            )
+        return self
 
 
 class TravelModeResponse(BaseModel):
@@ -72,6 +81,15 @@ class TravelModeResponse(BaseModel):
 # MODE RECOMMENDATION LOGIC
 # ============================================================================
 
+# Recommended modes per distance band (see utils.distance.DISTANCE_BANDS_KM)
+_MODES_BY_BAND = (
+    (TravelMode.CAR, TravelMode.BUS),
+    (TravelMode.TRAIN, TravelMode.BUS),
+    (TravelMode.TRAIN, TravelMode.FLIGHT),
+    (TravelMode.FLIGHT, TravelMode.TRAIN)
+)
+
+
 def get_recommended_modes(distance_km: int) -> List[TravelMode]:
     """
     Recommend travel modes based on distance.
@@ -95,14 +113,7 @@ def get_recommended_modes(distance_km: int) -> List[TravelMode]:
     Returns:
         List of recommended travel modes (ordered by preference)
     """
-    if distance_km <= 300:
-        return [TravelMode.CAR, TravelMode.BUS]
-    elif distance_km <= 700:
-        return [TravelMode.TRAIN, TravelMode.BUS]
-    elif distance_km <= 1200:
-        return [TravelMode.TRAIN, TravelMode.FLIGHT]
-    else:
-        return [TravelMode.FLIGHT, TravelMode.TRAIN]
+    return list(_MODES_BY_BAND[bisect_left(DISTANCE_BANDS_KM, distance_km)])
 
 
 def validate_preferred_mode(
@@ -157,86 +168,35 @@ def validate_preferred_mode(
 
 
 # ============================================================================
-# MAIN ENDPOINT
+# SHARED HANDLER LOGIC
 # ============================================================================
 
-@router.post("/api/travel/modes", response_model=TravelModeResponse)
-async def get_travel_modes(request: TravelModeRequest):
+# Distinct (distance, days, preferred mode) inputs whose results are kept;
+# the inputs are bounded and popular city pairs repeat
+TRAVEL_MODES_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=TRAVEL_MODES_CACHE_SIZE)
+def _evaluate_travel_modes(
+    distance_km: int,
+    days: int,
+    preferred_mode: Optional[TravelMode]
+) -> Tuple[Tuple[str, ...], Dict[str, str], bool, Optional[str]]:
     """
-    Get travel mode recommendations and validate preferred mode.
-    
-    **NEW: Two input modes**
-    1. City names (recommended):
-       - Validates against city database
-       - Auto-calculates distance
-       - Returns city names in response
-    
-    2. Raw distance (fallback):
-       - For pre-calculated distances
-       - Direct distance input
+    Recommend modes, estimate times and validate the preferred mode.
     
-    **Logic flow:**
-    - Calculate/use distance
-    - Get distance-appropriate travel mode recommendations
-    - Calculate estimated times for all modes
-    - Validate user's preferred mode (if provided)
+    Pure function of its arguments, so results are memoized. The returned
+    dict is shared between calls and must not be modified by callers.
     
     Args:
-        request: TravelModeRequest with cities/distance, days, and optional preferred mode
+        distance_km: Distance in kilometers
+        days: Trip duration in days
+        preferred_mode: User's preferred mode, if any
     
     Returns:
-        TravelModeResponse with recommendations and validation
+        Tuple of (recommended mode names, estimated times by mode name,
+        preferred_mode_valid, preferred_mode_reason)
     """
-    
-    distance_km = None
-    source_city_name = destination_city_name = None
-    
-    # ========================================================================
-    # INPUT VALIDATION: City names OR distance must be provided
-    # ========================================================================
-    
-    # Case 1: City names provided (recommended path)
-    if request.source_city and request.destination_city:
-        # Validate source city
-        if not validate_city_exists(request.source_city):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Source city '{request.source_city}' not found in database. "
-                       "Please use /api/locations/search to find valid cities."
-            )
-        
-        # Validate destination city
-        if not validate_city_exists(request.destination_city):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Destination city '{request.destination_city}' not found in database. "
-                       "Please use /api/locations/search to find valid cities."
-            )
-        
-        # Get city data and calculate distance
-        source_city = get_city_by_name(request.source_city)
-        dest_city = get_city_by_name(request.destination_city)
-        
-        distance_km = calculate_distance(
-            source_city["lat"], source_city["lon"],
-            dest_city["lat"], dest_city["lon"]
-        )
-        
-        source_city_name = source_city["name"]
-        destination_city_name = dest_city["name"]
-    
-    # Case 2: Raw distance provided (fallback)
-    elif request.distance_km:
-        distance_km = request.distance_km
-    
-    # Case 3: Neither provided - ERROR
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="Provide either (source_city + destination_city) OR distance_km. "
-                   "Do not mix both formats."
-        )
-    
     # ========================================================================
     # TRAVEL MODE RECOMMENDATIONS
     # ========================================================================
@@ -245,10 +205,7 @@ async def get_travel_modes(request: TravelModeRequest):
     recommended_modes = get_recommended_modes(distance_km)
     
     # Calculate estimated times for ALL modes (for comparison)
-    estimated_times = {}
-    for mode in TravelMode:
-        travel_time = calculate_travel_time(distance_km, mode)
-        estimated_times[mode.value] = format_travel_time(travel_time)
+    estimated_times = calculate_all_travel_times(distance_km)
     
     # ========================================================================
     # VALIDATE PREFERRED MODE (if provided)
@@ -257,29 +214,110 @@ async def get_travel_modes(request: TravelModeRequest):
     preferred_mode_valid = True
     preferred_mode_reason = None
     
-    if request.preferred_mode is not None:
+    if preferred_mode is not None:
         preferred_mode_valid, preferred_mode_reason = validate_preferred_mode(
             distance_km,
-            request.days,
-            request.preferred_mode,
+            days,
+            preferred_mode,
             recommended_modes
         )
     
-    # ========================================================================
-    # RESPONSE
-    # ========================================================================
+    return (
+        tuple(mode.value for mode in recommended_modes),
+        estimated_times,
+        preferred_mode_valid,
+        preferred_mode_reason
+    )
+
+
+def _build_travel_modes_response(
+    distance_km: int,
+    days: int,
+    preferred_mode: Optional[TravelMode],
+    source_city_name: Optional[str] = None,
+    destination_city_name: Optional[str] = None
+) -> TravelModeResponse:
+    """
+    Build the travel mode response for a distance.
+    
+    Args:
+        distance_km: Distance in kilometers
+        days: Trip duration in days
+        preferred_mode: User's preferred mode, if any
+        source_city_name: Canonical source city name (city input only)
+        destination_city_name: Canonical destination city name (city input only)
+    
+    Returns:
+        TravelModeResponse
+    """
+    recommended_modes, estimated_times, preferred_mode_valid, preferred_mode_reason = (
+        _evaluate_travel_modes(distance_km, days, preferred_mode)
+    )
     
-    return TravelModeResponse(
+    # Every field is computed here with the declared type, so skip validation.
+    # Containers are copied so responses never share the cached objects.
+    return TravelModeResponse.model_construct(
         distance_km=distance_km,
         source_city=source_city_name,
         destination_city=destination_city_name,
-        recommended_modes=[mode.value for mode in recommended_modes],
-        estimated_times=estimated_times,
+        recommended_modes=list(recommended_modes),
+        estimated_times=dict(estimated_times),
         preferred_mode_valid=preferred_mode_valid,
         preferred_mode_reason=preferred_mode_reason
     )
 
 
+# ============================================================================
+# MAIN ENDPOINT
+# ============================================================================
+
+@router.post("/api/travel/modes", response_model=TravelModeResponse)
+async def get_travel_modes(request: TravelModeRequest):
+    """
+    Get travel mode recommendations and validate preferred mode.
+    
+    **NEW: Two input modes**
+    1. City names (recommended):
+       - Validates against city database
+       - Auto-calculates distance
+       - Returns city names in response
+    
+    2. Raw distance (fallback):
+       - For pre-calculated distances
+       - Direct distance input
+    
+    **Logic flow:**
+    - Calculate/use distance
+    - Get distance-appropriate travel mode recommendations
+    - Calculate estimated times for all modes
+    - Validate user's preferred mode (if provided)
+    
+    Args:
+        request: TravelModeRequest with cities/distance, days, and optional preferred mode
+    
+    Returns:
+        TravelModeResponse with recommendations and validation
+    
+    Raises:
+        HTTPException 400: City not found
+        (missing input is rejected with 422 while parsing the request)
+    """
+    # Case 1: City names provided (recommended path)
+    if request.source_city and request.destination_city:
+        distance_km, source_city_name, destination_city_name = resolve_city_distance(
+            request.source_city, request.destination_city
+        )
+        return _build_travel_modes_response(
+            distance_km, request.days, request.preferred_mode,
+            source_city_name, destination_city_name
+        )
+    
+    # Case 2: Raw distance provided (fallback)
+    return _build_travel_modes_response(
+        request.distance_km, request.days, request.preferred_mode
+    )
+
+
 # ============================================================================
 # CONVENIENCE ENDPOINT: Quick city-to-city travel modes
 # ============================================================================
@@ -288,12 +326,15 @@ async def get_travel_modes(request: TravelModeRequest):
 async def get_travel_modes_simple(
     source_city: str,
     destination_city: str,
-    days: int,
+    days: int = Path(..., ge=1, le=30, description="Trip duration in days"),
     preferred_mode: Optional[TravelMode] = None
 ) -> TravelModeResponse:
     """
     Simplified GET endpoint for quick travel mode lookup
     
+    Path parameters are validated by FastAPI directly, so no
+    TravelModeRequest is built for this endpoint.
+    
     Example:
         GET /api/travel/modes/Mumbai/Goa/3
         GET /api/travel/modes/Mumbai/Goa/3?preferred_mode=train
@@ -307,41 +348,45 @@ async def get_travel_modes_simple(
     Returns:
         TravelModeResponse
     """
-    request = TravelModeRequest(
-        source_city=source_city,
-        destination_city=destination_city,
-        days=days,
-        preferred_mode=preferred_mode
+    distance_km, source_city_name, destination_city_name = resolve_city_distance(
+        source_city.strip(), destination_city.strip()
+    )
+    return _build_travel_modes_response(
+        distance_km, days, preferred_mode,
+        source_city_name, destination_city_name
     )
-    return await get_travel_modes(request)
 
 
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
 
+# Static payload, encoded once
+_HEALTH_BODY = encode_static({
+    "status": "ok",
+    "service": "travel_modes",
+    "data_source": "data/cities.py",
+    "input_modes": ["city_names", "raw_distance"],
+    "supported_modes": [mode.value for mode in TravelMode],
+    "speed_assumptions": {
+        "flight": "700 km/h + 3h buffer",
+        "train": "65 km/h average",
+        "bus": "45 km/h average",
+        "car": "55 km/h average"
+    },
+    "recommendation_logic": {
+        "0-300km": "car, bus",
+        "300-700km": "train, bus",
+        "700-1200km": "train, flight",
+        ">1200km": "flight, train"
+    }
+})
+
+
 @router.get("/api/travel/health")
-async def travel_health():
+async def travel_health() -> Response:
     """Health check for travel mode service"""
-    return {
-        "status": "ok",
-        "service": "travel_modes",
-        "data_source": "data/cities.py",
-        "input_modes": ["city_names", "raw_distance"],
-        "supported_modes": [mode.value for mode in TravelMode],
-        "speed_assumptions": {
-            "flight": "700 km/h + 3h buffer",
-            "train": "65 km/h average",
-            "bus": "45 km/h average",
-            "car": "55 km/h average"
-        },
-        "recommendation_logic": {
-            "0-300km": "car, bus",
-            "300-700km": "train, bus",
-            "700-1200km": "train, flight",
-            ">1200km": "flight, train"
-        }
-    }
+    return static_json_response(_HEALTH_BODY)
 
 
 # ============================================================================
@@ -11,18 +11,20 @@ This module:
 NO ITINERARY GENERATION HERE | PURE CONSTRAINT PROCESSING
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Mapping, Optional
 from enum import Enum
-import google.generativeai as genai
-import os
+from types import MappingProxyType
 import json
+import logging
+import re
+from services.gemini_client import gemini_semaphore, get_genai, get_model
+from utils.cache import TTLCache
+from utils.responses import encode_static, static_json_response
 
 router = APIRouter()
-
-# Initialize Gemini (for interest suggestion only)
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # ENUMS & CONSTANTS
@@ -45,7 +47,19 @@ class AIModel(str, Enum):
     GEMINI_FLASH = "gemini-flash-latest"
     GEMINI_2_5_FLASH = "gemini-2.5-flash"
 
-FALLBACK_INTERESTS = [
+# Model used for interest suggestions (shared instance via get_model)
+INTEREST_MODEL_NAME = "gemini-flash-latest"
+
+# AI-suggested interests keyed by interest_cache_key (per worker, 24h TTL)
+INTEREST_CACHE_SIZE = 1024
+INTEREST_CACHE_TTL = 24 * 3600
+_interest_cache = TTLCache(maxsize=INTEREST_CACHE_SIZE, ttl=INTEREST_CACHE_TTL)
+
+# Interests passed on to itinerary generation (extras are dropped)
+MAX_SELECTED_INTERESTS = 10
+
+# Tuple so the shared fallback cannot be mutated by a caller
+FALLBACK_INTERESTS = (
     "local food",
     "culture",
     "sightseeing",
@@ -54,7 +68,7 @@ FALLBACK_INTERESTS = [
     "photography",
     "relaxation",
     "local markets"
-]
+)
 
 # ============================================================================
 # REQUEST/RESPONSE SCHEMAS
@@ -66,12 +80,17 @@ class LocationInfo(BaseModel):
 
 class OptionalConstraints(BaseModel):
     """Optional user preferences"""
+    model_config = ConfigDict(frozen=True)
+    
     avoid_early_mornings: bool = Field(False, description="Prefer late starts")
     prefer_less_walking: bool = Field(False, description="Minimize walking distances")
     family_friendly: bool = Field(False, description="Family-appropriate activities")
     vegetarian_friendly: bool = Field(False, description="Vegetarian food options")
     photography_focus: bool = Field(False, description="Photography opportunities")
 
+# Frozen, so every request without preferences can share one instance
+_DEFAULT_OPTIONAL_CONSTRAINTS = OptionalConstraints()
+
 class TripConfigRequest(BaseModel):
     """Request for trip configuration"""
     source: LocationInfo
@@ -84,9 +103,17 @@ class TripConfigRequest(BaseModel):
     budget: BudgetTier
     
     selected_interests: Optional[List[str]] = Field(None, description="User-selected interests")
-    optional_constraints: OptionalConstraints = Field(default_factory=OptionalConstraints)
+    optional_constraints: OptionalConstraints = Field(default=_DEFAULT_OPTIONAL_CONSTRAINTS)
     
     ai_model: AIModel = Field(AIModel.GEMINI_FLASH, description="AI model for generation")
+    
+    @field_validator('selected_interests')
+    @classmethod
+    def cap_selected_interests(cls, v):
+        """Keep at most MAX_SELECTED_INTERESTS (prevent overwhelming AI)"""
+        if v is not None and len(v) > MAX_SELECTED_INTERESTS:
+            return v[:MAX_SELECTED_INTERESTS]
+        return v
 
 class TripSummary(BaseModel):
     """Read-only trip summary"""
@@ -133,7 +160,23 @@ class InterestSuggestionResponse(BaseModel):
 # PACE CONVERSION LOGIC (DETERMINISTIC)
 # ============================================================================
 
-def convert_pace_to_constraints(pace: TravelPace) -> dict:
+# Read-only so the shared entries cannot be changed by a caller
+_PACE_CONSTRAINTS = MappingProxyType({
+    TravelPace.RELAXED: MappingProxyType({
+        "places_per_day": 2,  # 1-2 places (using midpoint)
+        "start_time": "late"  # Start after 9 AM
+    }),
+    TravelPace.BALANCED: MappingProxyType({
+        "places_per_day": 3,  # 3-4 places (using lower bound for safety)
+        "start_time": "moderate"  # Start around 8 AM
+    }),
+    TravelPace.FAST: MappingProxyType({
+        "places_per_day": 4,  # 4-5 places (using lower bound)
+        "start_time": "early"  # Start before 8 AM
+    })
+})
+
+def convert_pace_to_constraints(pace: TravelPace) -> Mapping:
     """
     Convert travel pace into concrete constraints.
     
@@ -148,30 +191,30 @@ def convert_pace_to_constraints(pace: TravelPace) -> dict:
         pace: User's selected travel pace
     
     Returns:
-        Dict with places_per_day and start_time
+        Read-only mapping with places_per_day and start_time
     """
-    pace_mapping = {
-        TravelPace.RELAXED: {
-            "places_per_day": 2,  # 1-2 places (using midpoint)
-            "start_time": "late"  # Start after 9 AM
-        },
-        TravelPace.BALANCED: {
-            "places_per_day": 3,  # 3-4 places (using lower bound for safety)
-            "start_time": "moderate"  # Start around 8 AM
-        },
-        TravelPace.FAST: {
-            "places_per_day": 4,  # 4-5 places (using lower bound)
-            "start_time": "early"  # Start before 8 AM
-        }
-    }
-    
-    return pace_mapping[pace]
+    return _PACE_CONSTRAINTS[pace]
 
 # ============================================================================
 # BUDGET CONVERSION LOGIC (DETERMINISTIC)
 # ============================================================================
 
-def convert_budget_to_constraints(budget: BudgetTier) -> dict:
+_BUDGET_CONSTRAINTS = MappingProxyType({
+    BudgetTier.BASIC: MappingProxyType({
+        "experience_style": "popular & free attractions",
+        "comfort_level": "basic"
+    }),
+    BudgetTier.PREMIUM: MappingProxyType({
+        "experience_style": "balanced",
+        "comfort_level": "comfortable"
+    }),
+    BudgetTier.LUXURY: MappingProxyType({
+        "experience_style": "curated & relaxed",
+        "comfort_level": "high"
+    })
+})
+
+def convert_budget_to_constraints(budget: BudgetTier) -> Mapping:
     """
     Convert budget tier into experience assumptions.
     
@@ -189,24 +232,9 @@ def convert_budget_to_constraints(budget: BudgetTier) -> dict:
         budget: User's selected budget tier
     
     Returns:
-        Dict with experience_style and comfort_level
+        Read-only mapping with experience_style and comfort_level
     """
-    budget_mapping = {
-        BudgetTier.BASIC: {
-            "experience_style": "popular & free attractions",
-            "comfort_level": "basic"
-        },
-        BudgetTier.PREMIUM: {
-            "experience_style": "balanced",
-            "comfort_level": "comfortable"
-        },
-        BudgetTier.LUXURY: {
-            "experience_style": "curated & relaxed",
-            "comfort_level": "high"
-        }
-    }
-    
-    return budget_mapping[budget]
+    return _BUDGET_CONSTRAINTS[budget]
 
 # ============================================================================
 # AI INTEREST SUGGESTION (GEMINI ONLY)
@@ -232,31 +260,36 @@ def safe_extract_text(response) -> Optional[str]:
 
     return None
 
-def clean_json_response(raw_text: str) -> str:
-    """
-    Clean the JSON response by removing markdown formatting.
+# First flat JSON array in the text (interest lists never nest)
+_ARRAY_RE = re.compile(r"\[[^\[\]]*\]", re.DOTALL)
+
+def parse_interest_array(raw_text: str):
     """
-    # Remove markdown code blocks
-    if raw_text.startswith("```json"):
-        raw_text = raw_text[7:]  # Remove ```json
-    elif raw_text.startswith("```"):
-        raw_text = raw_text[3:]  # Remove ```
+    Parse the JSON array of interests from a Gemini response.
     
-    if raw_text.endswith("```"):
-        raw_text = raw_text[:-3]  # Remove trailing ```
+    Clean JSON (what the prompt asks for) is parsed directly; otherwise
+    the first [...] in the text is parsed, which skips markdown fences
+    and any surrounding prose.
     
-    return raw_text.strip()
-
-def suggest_interests_with_ai(
-    source: str,
-    destination: str,
-    travel_mode: str,
-    days: int,
-) -> list[str]:
-    """
-    Suggest interests using Gemini AI with proper error handling.
+    Args:
+        raw_text: Raw response text from Gemini
+    
+    Returns:
+        Parsed JSON value (validated by the caller)
+    
+    Raises:
+        json.JSONDecodeError: If no parseable array is found
     """
-    prompt = f"""
+    try:
+        return json.loads(raw_text)
+    except json.JSONDecodeError:
+        match = _ARRAY_RE.search(raw_text)
+        if match is None:
+            raise
+        return json.loads(match.group(0))
+
+# Static prompt text; only the trip details are filled per request
+_INTEREST_PROMPT_TEMPLATE = """
 Suggest a list of general travel interest categories for a trip.
 
 Trip details:
@@ -276,26 +309,70 @@ Return ONLY a valid JSON array of strings. No markdown, no code blocks, just the
 Example: ["beaches", "local food", "culture", "nightlife", "nature", "shopping", "photography", "heritage"]
 """
 
+def interest_cache_key(destination: str, travel_mode: str, days: int) -> tuple:
+    """
+    Cache key for interest suggestions.
+    
+    Interest categories depend on the destination and the kind of trip,
+    not on the exact day count or the origin, so days are bucketed
+    (short / medium / long) and the source city is left out.
+    
+    Args:
+        destination: Destination city name
+        travel_mode: Selected travel mode
+        days: Trip duration in days
+    
+    Returns:
+        Hashable key
+    """
+    days_bucket = 1 if days <= 2 else 2 if days <= 5 else 3
+    return (destination.strip().lower(), travel_mode.strip().lower(), days_bucket)
+
+async def suggest_interests_with_ai(
+    source: str,
+    destination: str,
+    travel_mode: str,
+    days: int,
+) -> list[str]:
+    """
+    Suggest interests using Gemini AI with proper error handling.
+    
+    Uses the async Gemini call, gated by the shared Gemini semaphore,
+    so the event loop keeps serving other requests meanwhile. Valid AI
+    suggestions are cached; fallbacks are not, so a failed call is
+    retried on the next request.
+    """
+    cache_key = interest_cache_key(destination, travel_mode, days)
+    cached = _interest_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+
+    prompt = _INTEREST_PROMPT_TEMPLATE.format_map({
+        "source": source,
+        "destination": destination,
+        "travel_mode": travel_mode,
+        "days": days,
+    })
+
     try:
-        model = genai.GenerativeModel("gemini-flash-latest")
-
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.7,
-                max_output_tokens=1000,  # Increased from 500
-            ),
-        )
+        genai = get_genai()
+        model = get_model(INTEREST_MODEL_NAME)
+
+        async with gemini_semaphore:
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=genai.GenerationConfig(
+                    temperature=0.7,
+                    max_output_tokens=1000,  # Increased from 500
+                ),
+            )
 
         raw_text = safe_extract_text(response)
         if not raw_text:
             raise ValueError("Gemini returned no usable text")
 
-        # Clean the response text
-        cleaned_text = clean_json_response(raw_text)
-        
-        # Parse JSON
-        interests = json.loads(cleaned_text)
+        # Parse JSON (tolerates markdown fences around the array)
+        interests = parse_interest_array(raw_text)
 
         # Validate the response
         if not isinstance(interests, list):
@@ -307,17 +384,17 @@ Example: ["beaches", "local food", "culture", "nightlife", "nature", "shopping",
         if len(interests) < 8 or len(interests) > 15:
             raise ValueError(f"AI returned {len(interests)} interests, expected 8-15")
 
+        _interest_cache.set(cache_key, tuple(interests))
         return interests
 
     except json.JSONDecodeError as e:
-        print(f"⚠️ Failed to parse JSON from AI response: {e}")
-        print(f"Raw response: {raw_text[:200] if raw_text else 'No response'}")
-        print(f"Cleaned response: {cleaned_text[:200] if 'cleaned_text' in locals() else 'Not cleaned'}")
-        return FALLBACK_INTERESTS
+        logger.warning("⚠️ Failed to parse JSON from AI response: %s", e)
+        logger.debug("Raw response: %.200s", raw_text)
+        return list(FALLBACK_INTERESTS)
     
     except Exception as e:
-        print(f"⚠️ Gemini failed, using fallback interests: {e}")
-        return FALLBACK_INTERESTS
+        logger.warning("⚠️ Gemini failed, using fallback interests: %s", e)
+        return list(FALLBACK_INTERESTS)
 
 # ============================================================================
 # INTEREST SUGGESTION ENDPOINT
@@ -343,7 +420,7 @@ async def suggest_interests(request: InterestSuggestionRequest):
     """
     
     try:
-        interests = suggest_interests_with_ai(
+        interests = await suggest_interests_with_ai(
             request.source,
             request.destination,
             request.travel_mode,
@@ -356,7 +433,7 @@ async def suggest_interests(request: InterestSuggestionRequest):
         )
     
     except Exception as e:
-        print(f"🔥 Unexpected error in interest suggestion: {e}")
+        logger.exception("🔥 Unexpected error in interest suggestion: %s", e)
         # Return fallback interests instead of raising error
         return InterestSuggestionResponse(
             interests=FALLBACK_INTERESTS,
@@ -419,14 +496,14 @@ async def configure_trip(request: TripConfigRequest):
             status_code=400,
             detail="At least one interest must be selected. Use /api/interests/suggest to get suggestions."
         )
-    
-    # Limit to 10 interests (prevent overwhelming AI)
-    final_interests = request.selected_interests[:10]
+    # (TripConfigRequest already caps the list at MAX_SELECTED_INTERESTS)
     
     # ========================================================================
     # STEP 4: BUILD TRIP SUMMARY
     # ========================================================================
-    trip_summary = TripSummary(
+    # Every field below comes from the validated request or the constant
+    # pace/budget tables, so the output models skip re-validation.
+    trip_summary = TripSummary.model_construct(
         source=request.source.name,
         destination=request.destination.name,
         distance_km=request.distance_km,
@@ -437,7 +514,7 @@ async def configure_trip(request: TripConfigRequest):
     # ========================================================================
     # STEP 5: BUILD CONSTRAINTS OBJECT
     # ========================================================================
-    constraints = ConstraintsOutput(
+    constraints = ConstraintsOutput.model_construct(
         pace=request.pace.value,
         places_per_day=pace_constraints["places_per_day"],
         start_time=pace_constraints["start_time"],
@@ -449,10 +526,10 @@ async def configure_trip(request: TripConfigRequest):
     # ========================================================================
     # STEP 6: RETURN COMPLETE STRUCTURED OBJECT
     # ========================================================================
-    return TripConfigResponse(
+    return TripConfigResponse.model_construct(
         trip_summary=trip_summary,
         constraints=constraints,
-        interests=final_interests,
+        interests=request.selected_interests,
         optional_constraints=request.optional_constraints,
         ai_model=request.ai_model.value
     )
@@ -461,21 +538,24 @@ async def configure_trip(request: TripConfigRequest):
 # HEALTH CHECK
 # ============================================================================
 
+# Static payload, encoded once
+_HEALTH_BODY = encode_static({
+    "status": "ok",
+    "service": "trip_configuration",
+    "endpoints": {
+        "suggest_interests": "/api/interests/suggest",
+        "configure_trip": "/api/trip/configure"
+    },
+    "ai_usage": "Only for interest suggestion",
+    "pace_options": [p.value for p in TravelPace],
+    "budget_options": [b.value for b in BudgetTier],
+    "ai_models": [m.value for m in AIModel]
+})
+
 @router.get("/api/trip/health")
-async def trip_config_health():
+async def trip_config_health() -> Response:
     """Health check for trip configuration service"""
-    return {
-        "status": "ok",
-        "service": "trip_configuration",
-        "endpoints": {
-            "suggest_interests": "/api/interests/suggest",
-            "configure_trip": "/api/trip/configure"
-        },
-        "ai_usage": "Only for interest suggestion",
-        "pace_options": [p.value for p in TravelPace],
-        "budget_options": [b.value for b in BudgetTier],
-        "ai_models": [m.value for m in AIModel]
-    }
+    return static_json_response(_HEALTH_BODY)
 
 # ============================================================================
 # EXAMPLE USAGE & TESTING
@@ -0,0 +1,50 @@
+"""
+Shared Gemini client access
+
+google.generativeai pulls in gRPC/protobuf when imported, which is slow
+and only needed by the AI-backed endpoints. It is imported and
+configured on first use instead of at application startup.
+"""
+
+import asyncio
+import os
+from functools import lru_cache
+
+_genai = None
+
+# Cap on in-flight Gemini calls per worker, shared by every AI-backed
+# endpoint so that together they stay under the API's rate limit
+GEMINI_MAX_CONCURRENCY = 8
+gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+
+def get_genai():
+    """
+    Import and configure google.generativeai on first use.
+    
+    Returns:
+        The configured google.generativeai module
+    """
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        _genai = genai
+    return _genai
+
+
+@lru_cache(maxsize=8)
+def get_model(model_name: str):
+    """
+    Get a shared GenerativeModel instance for a model name.
+    
+    The model object holds no per-request state, so one instance per
+    name is reused instead of being constructed on every call.
+    
+    Args:
+        model_name: Gemini model identifier
+    
+    Returns:
+        google.generativeai.GenerativeModel
+    """
+    return get_genai().GenerativeModel(model_name)
@@ -11,12 +11,22 @@ This module ensures:
 """
 
 import math
-from typing import Tuple
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
 
 # ============================================================================
 # HAVERSINE DISTANCE CALCULATOR
 # ============================================================================
 
+# Earth's radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Same factor math.radians() multiplies by, so results are bit-identical
+_DEG_TO_RAD = math.pi / 180.0
+
+_sin, _cos, _sqrt, _atan2 = math.sin, math.cos, math.sqrt, math.atan2
+
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate great-circle distance between two points on Earth
@@ -39,25 +49,56 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
         c = 2 × atan2(√a, √(1−a))
         distance = R × c  (where R = Earth's radius)
     """
-    # Earth's radius in kilometers
-    R = 6371.0
-    
     # Convert degrees to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
+    lat1_rad = lat1 * _DEG_TO_RAD
+    lat2_rad = lat2 * _DEG_TO_RAD
     
-    # Differences
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
+    # Half-angle sines of the differences
+    sin_dlat = _sin((lat2_rad - lat1_rad) / 2)
+    sin_dlon = _sin((lon2 * _DEG_TO_RAD - lon1 * _DEG_TO_RAD) / 2)
     
     # Haversine formula
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    a = sin_dlat ** 2 + _cos(lat1_rad) * _cos(lat2_rad) * sin_dlon ** 2
+    c = 2 * _atan2(_sqrt(a), _sqrt(1 - a))
+    
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_all(
+    lat0: float,
+    lon0: float,
+    lats: Sequence[float],
+    lons: Sequence[float]
+) -> List[float]:
+    """
+    Calculate distances from one point to many points in a single pass.
     
-    distance = R * c
-    return distance
+    Same formula as haversine_distance, with the source point's
+    trigonometry hoisted out of the loop. Intended for the parallel
+    coordinate arrays in data/cities.py (CITY_LATS / CITY_LONS).
+    
+    Args:
+        lat0, lon0: Source coordinates in decimal degrees
+        lats, lons: Target coordinates in decimal degrees (parallel sequences)
+    
+    Returns:
+        Distances in kilometers (float), in the same order as the targets
+    """
+    R, deg_to_rad = EARTH_RADIUS_KM, _DEG_TO_RAD
+    sin, cos, sqrt, atan2 = _sin, _cos, _sqrt, _atan2
+    
+    lat0_rad = lat0 * deg_to_rad
+    lon0_rad = lon0 * deg_to_rad
+    cos_lat0 = cos(lat0_rad)
+    
+    distances = []
+    for lat, lon in zip(lats, lons):
+        lat_rad = lat * deg_to_rad
+        sin_dlat = sin((lat_rad - lat0_rad) / 2)
+        sin_dlon = sin((lon * deg_to_rad - lon0_rad) / 2)
+        a = sin_dlat ** 2 + cos_lat0 * cos(lat_rad) * sin_dlon ** 2
+        distances.append(R * (2 * atan2(sqrt(a), sqrt(1 - a))))
+    return distances
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> int:
@@ -86,6 +127,14 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> in
 # INDIA-SPECIFIC FEASIBILITY RULES
 # ============================================================================
 
+# Upper bounds (inclusive, km) of the short / medium / long distance bands;
+# anything beyond the last is very long. bisect_left(DISTANCE_BANDS_KM, d)
+# gives the band index 0-3 for a distance d.
+DISTANCE_BANDS_KM = (300, 700, 1200)
+
+_MINIMUM_DAYS_BY_BAND = (2, 3, 4, 5)
+_CATEGORY_BY_BAND = ("short", "medium", "long", "very_long")
+
 def calculate_minimum_days(distance_km: int) -> int:
     """
     Determine minimum trip duration based on distance.
@@ -119,14 +168,7 @@ def calculate_minimum_days(distance_km: int) -> int:
         >>> calculate_minimum_days(2157)
         5  # Delhi to Bangalore
     """
-    if distance_km <= 300:
-        return 2
-    elif distance_km <= 700:
-        return 3
-    elif distance_km <= 1200:
-        return 4
-    else:
-        return 5
+    return _MINIMUM_DAYS_BY_BAND[bisect_left(DISTANCE_BANDS_KM, distance_km)]
 
 
 def is_route_feasible(distance_km: int, days: int) -> Tuple[bool, int, str]:
@@ -174,8 +216,8 @@ def calculate_city_distance(city1_name: str, city2_name: str) -> int:
     """
     Calculate distance between two cities by name.
     
-    Convenience function that looks up cities from database
-    and calculates distance in one call.
+    Convenience function that reads the distance from the city
+    database's precomputed distance matrix.
     
     Args:
         city1_name: First city name
@@ -191,20 +233,15 @@ def calculate_city_distance(city1_name: str, city2_name: str) -> int:
         >>> calculate_city_distance("Mumbai", "Goa")
         461
     """
-    from data.cities import get_city_by_name
+    from data.cities import get_city_distance, validate_city_exists
     
-    city1 = get_city_by_name(city1_name)
-    city2 = get_city_by_name(city2_name)
+    distance = get_city_distance(city1_name, city2_name)
+    if distance is not None:
+        return distance
     
-    if not city1:
+    if not validate_city_exists(city1_name):
         raise ValueError(f"City '{city1_name}' not found in database")
-    if not city2:
-        raise ValueError(f"City '{city2_name}' not found in database")
-    
-    return calculate_distance(
-        city1["lat"], city1["lon"],
-        city2["lat"], city2["lon"]
-    )
+    raise ValueError(f"City '{city2_name}' not found in database")
 
 
 # ============================================================================
@@ -233,9 +270,15 @@ def calculate_route_distance(cities: list[str]) -> int:
     if len(cities) < 2:
         raise ValueError("Need at least 2 cities to calculate route distance")
     
+    from data.cities import get_city_distance
+    
+    # Each leg is one lookup in the precomputed distance matrix
     total_distance = 0
-    for i in range(len(cities) - 1):
-        distance = calculate_city_distance(cities[i], cities[i + 1])
+    for city_a, city_b in zip(cities, cities[1:]):
+        distance = get_city_distance(city_a, city_b)
+        if distance is None:
+            # Unknown city: raises with the missing name
+            calculate_city_distance(city_a, city_b)
         total_distance += distance
     
     return total_distance
@@ -261,14 +304,7 @@ def get_distance_category(distance_km: int) -> str:
         >>> get_distance_category(2157)
         'very_long'
     """
-    if distance_km <= 300:
-        return "short"
-    elif distance_km <= 700:
-        return "medium"
-    elif distance_km <= 1200:
-        return "long"
-    else:
-        return "very_long"
+    return _CATEGORY_BY_BAND[bisect_left(DISTANCE_BANDS_KM, distance_km)]
 
 
 def estimate_travel_cost_multiplier(distance_km: int) -> float:
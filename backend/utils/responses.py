@@ -0,0 +1,38 @@
+"""
+Pre-encoded JSON Responses
+
+Helpers for endpoints whose response body never changes (health checks,
+static stats): the JSON is encoded once at import and each request just
+returns the bytes.
+"""
+
+import json
+from typing import Dict
+
+from fastapi import Response
+
+
+def encode_static(payload: Dict) -> bytes:
+    """
+    Encode a response body that never changes, once at import time.
+    
+    Uses the same compact UTF-8 encoding as FastAPI's JSONResponse, so
+    the bytes are identical to what the endpoint would return.
+    
+    Args:
+        payload: JSON-serializable response body
+    
+    Returns:
+        Encoded JSON body
+    """
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def static_json_response(body: bytes) -> Response:
+    """Wrap a body from encode_static() in a JSON response"""
+    return Response(content=body, media_type="application/json")
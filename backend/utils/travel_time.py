@@ -11,7 +11,9 @@ This module ensures:
 """
 
 from enum import Enum
-from typing import Dict, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
 # ============================================================================
 # ENUMS & CONSTANTS
@@ -47,6 +49,25 @@ SPEED_CONFIG = {
 }
 
 
+# (speed km/h, fixed buffer hours) per mode, flattened from SPEED_CONFIG so
+# travel time is a single divide-and-add for every mode
+_TIMING_BY_MODE: Dict[TravelMode, Tuple[float, float]] = {
+    mode: (
+        config.get("cruise_speed", config.get("avg_speed")),
+        config.get("fixed_buffer", 0.0)
+    )
+    for mode, config in SPEED_CONFIG.items()
+}
+
+# Modes in TravelMode order, and (mode name, speed, buffer) at the same
+# positions, so all modes can be timed in one pass and picked by index
+_MODES = tuple(TravelMode)
+_MODE_TIMINGS = tuple(
+    (mode.value, *_TIMING_BY_MODE[mode])
+    for mode in _MODES
+)
+
+
 # ============================================================================
 # TIME CALCULATION FUNCTIONS
 # ============================================================================
@@ -74,24 +95,26 @@ def calculate_travel_time(distance_km: int, mode: TravelMode) -> float:
         >>> calculate_travel_time(2157, TravelMode.FLIGHT)
         6.081  # ~6h 5m for Delhi to Bangalore
     """
-    if mode == TravelMode.FLIGHT:
-        # Flight time = (distance / cruise speed) + fixed buffer
-        flying_time = distance_km / SPEED_CONFIG[TravelMode.FLIGHT]["cruise_speed"]
-        total_time = flying_time + SPEED_CONFIG[TravelMode.FLIGHT]["fixed_buffer"]
-        return total_time
-    
-    elif mode == TravelMode.TRAIN:
-        return distance_km / SPEED_CONFIG[TravelMode.TRAIN]["avg_speed"]
+    timing = _TIMING_BY_MODE.get(mode)
+    if timing is None:
+        return 0.0
     
-    elif mode == TravelMode.BUS:
-        return distance_km / SPEED_CONFIG[TravelMode.BUS]["avg_speed"]
-    
-    elif mode == TravelMode.CAR:
-        return distance_km / SPEED_CONFIG[TravelMode.CAR]["avg_speed"]
-    
-    return 0.0
+    # distance / speed, plus the fixed buffer (only flights have one)
+    speed, buffer = timing
+    return distance_km / speed + buffer
+
+
+def _hours_by_position(distance_km: int) -> list[float]:
+    """Travel time in hours for every mode, positionally matching _MODES"""
+    return [distance_km / speed + buffer for _, speed, buffer in _MODE_TIMINGS]
+
 
+# Distinct hour values whose formatted strings are kept; hours come from a
+# bounded set of (distance, mode) pairs
+FORMAT_CACHE_SIZE = 8192
 
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def format_travel_time(hours: float) -> str:
     """
     Format travel time into human-readable string.
@@ -158,11 +181,10 @@ def calculate_all_travel_times(distance_km: int) -> Dict[str, str]:
             'car': '8h 23m'
         }
     """
-    times = {}
-    for mode in TravelMode:
-        travel_time = calculate_travel_time(distance_km, mode)
-        times[mode.value] = format_travel_time(travel_time)
-    return times
+    return {
+        mode: format_travel_time(distance_km / speed + buffer)
+        for mode, speed, buffer in _MODE_TIMINGS
+    }
 
 
 def get_fastest_mode(distance_km: int) -> TravelMode:
@@ -181,11 +203,8 @@ def get_fastest_mode(distance_km: int) -> TravelMode:
         >>> get_fastest_mode(150)
         <TravelMode.CAR: 'car'>
     """
-    times = {}
-    for mode in TravelMode:
-        times[mode] = calculate_travel_time(distance_km, mode)
-    
-    return min(times, key=times.get)
+    hours = _hours_by_position(distance_km)
+    return _MODES[hours.index(min(hours))]
 
 
 def get_slowest_mode(distance_km: int) -> TravelMode:
@@ -204,11 +223,8 @@ def get_slowest_mode(distance_km: int) -> TravelMode:
         >>> get_slowest_mode(461)
         <TravelMode.BUS: 'bus'>
     """
-    times = {}
-    for mode in TravelMode:
-        times[mode] = calculate_travel_time(distance_km, mode)
-    
-    return max(times, key=times.get)
+    hours = _hours_by_position(distance_km)
+    return _MODES[hours.index(max(hours))]
 
 
 # ============================================================================
@@ -280,12 +296,13 @@ def get_time_feasible_modes(distance_km: int, days: int) -> list[TravelMode]:
         [<TravelMode.FLIGHT: 'flight'>, <TravelMode.TRAIN: 'train'>, 
          <TravelMode.CAR: 'car'>, <TravelMode.BUS: 'bus'>]  # All modes work
     """
-    feasible_modes = []
-    for mode in TravelMode:
-        is_feasible, _ = is_mode_time_feasible(distance_km, days, mode)
-        if is_feasible:
-            feasible_modes.append(mode)
-    return feasible_modes
+    # Same 40% rule as is_mode_time_feasible, without building reason strings
+    total_trip_hours = days * 24
+    return [
+        mode
+        for mode, travel_hours in zip(_MODES, _hours_by_position(distance_km))
+        if (travel_hours / total_trip_hours) * 100 <= 40.0
+    ]
 
 
 # ============================================================================
@@ -332,17 +349,24 @@ def get_effective_trip_days(total_days: int, distance_km: int, mode: TravelMode)
         >>> get_effective_trip_days(3, 2157, TravelMode.TRAIN)
         0.17  # Only ~4 hours at destination if taking train!
     """
-    round_trip_hours = calculate_round_trip_time(distance_km, mode)
-    total_hours = total_days * 24
-    effective_hours = total_hours - round_trip_hours
-    return effective_hours / 24
+    # Round trip inlined (same arithmetic as calculate_round_trip_time)
+    round_trip_hours = calculate_travel_time(distance_km, mode) * 2
+    return (total_days * 24 - round_trip_hours) / 24
 
 
 # ============================================================================
 # COST ESTIMATION (RELATIVE)
 # ============================================================================
 
-def get_relative_cost_order() -> Dict[TravelMode, int]:
+# Read-only, so every caller can share the same ranking
+_RELATIVE_COST_ORDER: Mapping[TravelMode, int] = MappingProxyType({
+    TravelMode.BUS: 1,
+    TravelMode.TRAIN: 2,
+    TravelMode.CAR: 3,
+    TravelMode.FLIGHT: 4
+})
+
+def get_relative_cost_order() -> Mapping[TravelMode, int]:
     """
     Get relative cost ranking for modes (1 = cheapest, 4 = most expensive).
     
@@ -353,7 +377,7 @@ def get_relative_cost_order() -> Dict[TravelMode, int]:
     - Flight: Most expensive
     
     Returns:
-        Dict mapping modes to cost rank
+        Read-only mapping of modes to cost rank
     
     Example:
         >>> order = get_relative_cost_order()
@@ -362,12 +386,7 @@ def get_relative_cost_order() -> Dict[TravelMode, int]:
         >>> order[TravelMode.FLIGHT]
         4  # Most expensive
     """
-    return {
-        TravelMode.BUS: 1,
-        TravelMode.TRAIN: 2,
-        TravelMode.CAR: 3,
-        TravelMode.FLIGHT: 4
-    }
+    return _RELATIVE_COST_ORDER
 
 
 def get_cheapest_mode() -> TravelMode:
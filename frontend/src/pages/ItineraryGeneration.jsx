@@ -34,7 +34,9 @@ export default function ItineraryGeneration() {
   // ============================================================================
   // GENERATE ITINERARY
   // ============================================================================
-  const handleGenerateItinerary = async () => {
+  // regenerate=true asks the backend for a fresh itinerary instead of a
+  // recently cached one for the same configuration
+  const handleGenerateItinerary = async (regenerate = false) => {
     if (!configuration) return;
 
     setLoading(true);
@@ -42,7 +44,10 @@ export default function ItineraryGeneration() {
     setItinerary(null);
 
     try {
-      const response = await fetch("http://127.0.0.1:8000/api/itinerary", {
+      const url = regenerate
+        ? "http://127.0.0.1:8000/api/itinerary?regenerate=true"
+        : "http://127.0.0.1:8000/api/itinerary";
+      const response = await fetch(url, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(configuration),
@@ -193,7 +198,7 @@ export default function ItineraryGeneration() {
             </div>
 
             <button
-              onClick={handleGenerateItinerary}
+              onClick={() => handleGenerateItinerary(false)}
               disabled={loading}
               className="w-full bg-blue-600 hover:bg-blue-700 disabled:bg-gray-400 text-white font-bold py-3 px-4 rounded disabled:cursor-not-allowed"
             >
@@ -234,7 +239,7 @@ export default function ItineraryGeneration() {
                 </h3>
                 <p className="text-sm text-red-700 mb-4">{error}</p>
                 <button
-                  onClick={handleGenerateItinerary}
+                  onClick={() => handleGenerateItinerary(true)}
                   className="bg-red-600 hover:bg-red-700 text-white font-semibold py-2 px-4 rounded"
                 >
                   Try Again
@@ -283,7 +288,7 @@ export default function ItineraryGeneration() {
                 </button>
 
                 <button
-                  onClick={handleGenerateItinerary}
+                  onClick={() => handleGenerateItinerary(true)}
                   className="bg-blue-600 hover:bg-blue-700 text-white font-semibold py-2 px-4 rounded text-sm"
                 >
                   🔄 Regenerate
@@ -458,7 +463,7 @@ export default function ItineraryGeneration() {
               </p>
               <div className="flex flex-wrap gap-3 justify-center">
                 <button
-                  onClick={handleGenerateItinerary}
+                  onClick={() => handleGenerateItinerary(true)}
                   className="bg-blue-600 hover:bg-blue-700 text-white font-semibold py-2 px-6 rounded"
                 >
                   🔄 Generate Another